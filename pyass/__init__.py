@@ -1,3 +1,10 @@
+import bz2 as _bz2
+import codecs as _codecs
+import gzip as _gzip
+import itertools as _itertools
+import lzma as _lzma
+import mmap as _mmap
+import os as _os
 import typing as _typing
 
 from .color import Color
@@ -12,11 +19,14 @@ from .enum import (
     Wrapping,
 )
 from .event import Event, EventPart
+from .eventtable import EventTable
+from .eventview import EventView, EventViewList
 from .position import Position
 from .script import Script
 from .section import (
     AegisubGarbageSection,
     EventsSection,
+    LazySection,
     ScriptInfoSection,
     Section,
     StylesSection,
@@ -50,6 +60,7 @@ from .tag import (
     StrikeoutTag,
     Tag,
     Tags,
+    TagsCache,
     TextRotationTag,
     TextScaleTag,
     TextShearTag,
@@ -59,19 +70,171 @@ from .tag import (
     WrappingStyleTag,
 )
 from .timedelta import timedelta
+from .timestamp import Timestamp
 
 
-def load(fp: _typing.IO[str]) -> Script:
-    return loads(fp.read())
+def _iter_lines(fp: _typing.IO[str]) -> _typing.Iterator[str]:
+    # Split each physical line the same way str.splitlines would split the whole file
+    for line in fp:
+        yield from line.splitlines()
 
 
-def loads(s: str) -> Script:
-    return Script.parse(s)
+# Checked in order, since the UTF-32 LE BOM starts with the UTF-16 LE one
+_BOMS = [
+    (_codecs.BOM_UTF8, "utf_8"),
+    (_codecs.BOM_UTF32_LE, "utf_32_le"),
+    (_codecs.BOM_UTF32_BE, "utf_32_be"),
+    (_codecs.BOM_UTF16_LE, "utf_16_le"),
+    (_codecs.BOM_UTF16_BE, "utf_16_be"),
+]
 
+# Compressed files are recognized by their magic number when loading,
+# and by their extension when dumping
+_COMPRESSIONS = [
+    (b"\x1f\x8b", ".gz", _gzip.open),
+    (b"BZh", ".bz2", _bz2.open),
+    (b"\xfd7zXZ\x00", ".xz", _lzma.open),
+]
 
-def dump(o: Script, fp: _typing.IO[str]) -> None:
-    o.dump(fp)
+# Files are decoded this many bytes at a time
+_DECODE_CHUNK_SIZE = 1 << 20
 
 
-def dumps(o: Script) -> str:
-    return o.dumps()
+def _detect_encoding(buffer: bytes) -> tuple[str, int]:
+    # The encoding named by the BOM and the length of the BOM, UTF-8 if there is none
+    for bom, encoding in _BOMS:
+        if buffer[: len(bom)] == bom:
+            return encoding, len(bom)
+
+    return "utf_8", 0
+
+
+def _iter_mapped_chunks(buffer: _mmap.mmap) -> _typing.Iterator[bytes]:
+    for i in range(0, len(buffer), _DECODE_CHUNK_SIZE):
+        yield buffer[i : i + _DECODE_CHUNK_SIZE]
+
+
+def _iter_read_chunks(fp: _typing.IO[bytes]) -> _typing.Iterator[bytes]:
+    return iter(lambda: fp.read(_DECODE_CHUNK_SIZE), b"")
+
+
+def _iter_decoded_lines(
+    chunks: _typing.Iterable[bytes], encoding: _typing.Optional[str]
+) -> _typing.Iterator[str]:
+    # Decodes one chunk at a time, so the whole file is never decoded at once
+    # The encoding is detected from the BOM at the start unless given
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= max(len(bom) for bom, _ in _BOMS):
+            break
+
+    if not head:
+        return
+
+    detectedEncoding, bomLength = _detect_encoding(head)
+    if encoding is None:
+        encoding = detectedEncoding
+    elif _codecs.lookup(encoding).name != _codecs.lookup(detectedEncoding).name:
+        # e.g. utf_8_sig and utf_16 strip the BOM themselves
+        bomLength = 0
+
+    decoder = _codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in _itertools.chain([head[bomLength:]], chunks):
+        text = pending + decoder.decode(chunk)
+
+        # Anything after the last \n may continue in the next chunk, even a \r
+        cut = text.rfind("\n") + 1
+        pending = text[cut:]
+        yield from text[:cut].splitlines()
+
+    yield from (pending + decoder.decode(b"", True)).splitlines()
+
+
+def load(fp: _typing.IO[str], lazy: bool = False, workers: int = 1) -> Script:
+    return loads(fp.read(), lazy, workers)
+
+
+def loads(s: str, lazy: bool = False, workers: int = 1) -> Script:
+    return Script.parse(s, lazy, workers)
+
+
+def load_path(
+    path: str | _os.PathLike,
+    lazy: bool = False,
+    encoding: _typing.Optional[str] = None,
+    workers: int = 1,
+) -> Script:
+    # Plain files are memory-mapped, compressed ones are decompressed as they are parsed
+    # The encoding is detected from the BOM unless given
+    with open(path, "rb") as f:
+        magic = f.read(max(len(magic) for magic, _, _ in _COMPRESSIONS))
+        f.seek(0)
+        for compressedMagic, _, openCompressed in _COMPRESSIONS:
+            if magic.startswith(compressedMagic):
+                with openCompressed(f, "rb") as decompressed:
+                    return Script.parseLines(
+                        _iter_decoded_lines(_iter_read_chunks(decompressed), encoding),
+                        lazy,
+                        workers,
+                    )
+
+        # Empty files cannot be mapped
+        if not magic:
+            return loads("", lazy, workers)
+
+        with _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) as buffer:
+            return Script.parseLines(
+                _iter_decoded_lines(_iter_mapped_chunks(buffer), encoding),
+                lazy,
+                workers,
+            )
+
+
+def dump_path(
+    o: Script,
+    path: str | _os.PathLike,
+    encoding: str = "utf_8_sig",
+    workers: int = 1,
+) -> None:
+    # Compressed if the extension is that of a supported format
+    # Lines are compressed as they are produced, so the script is never held in memory
+    openFile = open
+    for _, extension, openCompressed in _COMPRESSIONS:
+        if _os.fspath(path).endswith(extension):
+            openFile = openCompressed
+
+    with openFile(path, "wt", encoding=encoding, newline="") as f:
+        o.dump(f, workers)
+
+
+def dump(o: Script, fp: _typing.IO[str], workers: int = 1) -> None:
+    o.dump(fp, workers)
+
+
+def dumps(o: Script, workers: int = 1) -> str:
+    return o.dumps(workers)
+
+
+def iter_lines(o: Script, workers: int = 1) -> _typing.Iterator[str]:
+    return o.iterLines(workers)
+
+
+def view_events(
+    buffer: str | bytes | bytearray, encoding: str = "utf-8"
+) -> EventViewList:
+    return EventViewList.fromBuffer(buffer, encoding)
+
+
+def iter_sections(fp: _typing.IO[str]) -> _typing.Iterator[Section]:
+    return Section.iterSections(_iter_lines(fp))
+
+
+def iter_styles(fp: _typing.IO[str]) -> _typing.Iterator[Style]:
+    return StylesSection.iterStyles(_iter_lines(fp))
+
+
+def iter_events(fp: _typing.IO[str]) -> _typing.Iterator[Event]:
+    return EventsSection.iterEvents(_iter_lines(fp))
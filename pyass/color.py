@@ -4,7 +4,7 @@ from typing import TypeVar
 Color = TypeVar("Color", bound="Color")
 
 
-@dataclass
+@dataclass(slots=True)
 class Color:
     r: int = 0x00
     g: int = 0x00
@@ -2,6 +2,6 @@ from dataclasses import dataclass
 
 
 # TODO: Implement this class
-@dataclass
+@dataclass(slots=True)
 class DrawingCommand:
     text: str
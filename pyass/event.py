@@ -1,15 +1,13 @@
-import re
-import threading
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Sequence, TypeVar
+from typing import Optional, Sequence, TypeVar
 
 from pyass.enum import EventFormat
 from pyass.tag import Tag, Tags
-from pyass.timedelta import timedelta as pyasstimedelta
+from pyass.timestamp import Timestamp
 
 
-@dataclass
+@dataclass(slots=True)
 class EventPart:
     tags: Tags
     text: str
@@ -27,12 +25,28 @@ Event = TypeVar("Event", bound="Event")
 
 @dataclass
 class Event:
+    __slots__ = (
+        "format",
+        "layer",
+        "start",
+        "end",
+        "style",
+        "name",
+        "marginL",
+        "marginR",
+        "marginV",
+        "effect",
+        "_content",
+        "_unknownRawText",
+        "_source",
+    )
+
     def __init__(
         self,
         format: EventFormat = EventFormat.DIALOGUE,
         layer: int = 0,
-        start: timedelta = timedelta(),
-        end: timedelta = timedelta(),
+        start: timedelta | Timestamp = Timestamp(),
+        end: timedelta | Timestamp = Timestamp(),
         style: str = "Default",
         name: str = "",
         marginL: int = 0,
@@ -56,55 +70,126 @@ class Event:
         self.marginR = marginR
         self.marginV = marginV
         self.effect = effect
-        self._parts = parts
-
-        self._textParseLock = threading.Lock()
-        self._unparsedText = ""
 
-        if text:
-            self.text = text
+        # Either the unparsed text or the parsed parts, never both
+        # Parsing swaps one for the other in a single assignment, so no lock is needed
+        self._content: str | Sequence[EventPart] = parts if parts else text
 
         self._unknownRawText = ""
 
+        # The line this event was last parsed from or printed as,
+        # along with the fields that line was made from
+        self._source: Optional[tuple[str, tuple]] = None
+
     def __str__(self) -> str:
         if self._unknownRawText:
             return self._unknownRawText
 
+        # Untouched events reuse the line they were last read or printed as
+        # Handing out the parts replaces the text, so edits through them are noticed too
+        fields = self._printedFields()
+        source = self._source
+        if source is not None and source[1] == fields:
+            return source[0]
+
         # Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-        return f"{self.format}: {self.layer},{pyasstimedelta(self.start)},{pyasstimedelta(self.end)},{self.style},{self.name},{self.marginL},{self.marginR},{self.marginV},{self.effect},{self.text}"
+        ret = f"{self.format}: {self.layer},{Timestamp(self.start)},{Timestamp(self.end)},{self.style},{self.name},{self.marginL},{self.marginR},{self.marginV},{self.effect},{self.text}"
+
+        # Parts can be edited in place without the event knowing, so only text is cached
+        if isinstance(self._content, str):
+            self._source = (ret, fields)
+
+        return ret
+
+    def __reduce__(self):
+        # Events are pickled in bulk when parsed in parallel, so they are kept compact
+        # The source line only goes along while it still matches the fields
+        source = self._source
+        sourceLine = (
+            source[0]
+            if source is not None and source[1] == self._printedFields()
+            else ""
+        )
+        return (
+            Event._unpickle,
+            (
+                self.format,
+                self.layer,
+                self.start,
+                self.end,
+                self.style,
+                self.name,
+                self.marginL,
+                self.marginR,
+                self.marginV,
+                self.effect,
+                self._content,
+                self._unknownRawText,
+                sourceLine,
+            ),
+        )
+
+    @staticmethod
+    def _unpickle(
+        format: EventFormat,
+        layer: int,
+        start: timedelta | Timestamp,
+        end: timedelta | Timestamp,
+        style: str,
+        name: str,
+        marginL: int,
+        marginR: int,
+        marginV: int,
+        effect: str,
+        content: str | Sequence[EventPart],
+        unknownRawText: str,
+        sourceLine: str,
+    ) -> Event:
+        # Skips __init__, whose defaults would only be overwritten
+        ret = object.__new__(Event)
+        ret.format = format
+        ret.layer = layer
+        ret.start = start
+        ret.end = end
+        ret.style = style
+        ret.name = name
+        ret.marginL = marginL
+        ret.marginR = marginR
+        ret.marginV = marginV
+        ret.effect = effect
+        ret._content = content
+        ret._unknownRawText = unknownRawText
+        ret._source = (sourceLine, ret._printedFields()) if sourceLine else None
+        return ret
 
     @property
     def text(self) -> str:
-        with self._textParseLock:
-            if self._unparsedText:
-                return self._unparsedText
+        content = self._content
+        if isinstance(content, str):
+            return content
 
-        return "".join([str(part) for part in self._parts])
+        return "".join([str(part) for part in content])
 
     @text.setter
     def text(self, text: str) -> None:
-        with self._textParseLock:
-            self._unparsedText = text
+        self._content = text
 
     @property
     def parts(self) -> Sequence[EventPart]:
-        with self._textParseLock:
-            if not self._unparsedText:
-                return self._parts
-
-            self._set_parts_from_text(self._unparsedText)
-            self._unparsedText = ""
+        content = self._content
+        if isinstance(content, str):
+            # Concurrent first accesses may both parse, but they produce equal parts
+            content = Event._parts_from_text(content)
+            self._content = content
 
-        return self._parts
+        return content
 
     @parts.setter
     def parts(self, parts: Sequence[EventPart]) -> None:
-        with self._textParseLock:
-            self._parts = parts
-            self._unparsedText = ""
+        self._content = parts
 
     @property
-    def length(self) -> timedelta:
+    def length(self) -> timedelta | Timestamp:
         return self.end - self.start
 
     @staticmethod
@@ -132,39 +217,64 @@ class Event:
             ret.layer, ret.marginL, ret.marginR, ret.marginV = map(
                 int, [layerStr, marginLStr, marginRStr, marginVStr]
             )
-            ret.start, ret.end = map(pyasstimedelta.parse, [startStr, endStr])
+            ret.start, ret.end = map(Timestamp.parse, [startStr, endStr])
+            ret._source = (s, ret._printedFields())
         except:
             ret._unknownRawText = s
 
         return ret
 
-    def _set_parts_from_text(self, text: str) -> None:
+    def _printedFields(self) -> tuple:
+        return (
+            self.format,
+            self.layer,
+            self.start,
+            self.end,
+            self.style,
+            self.name,
+            self.marginL,
+            self.marginR,
+            self.marginV,
+            self.effect,
+            self._content,
+        )
+
+    @staticmethod
+    def _parts_from_text(text: str) -> list[EventPart]:
         # Short-circuit for empty string
         if not text:
-            self._parts = []
-            return
+            return []
 
         # Short-circuit for text with no tags
         if "{" not in text or "}" not in text:
-            self._parts = [EventPart(text=text)]
-            return
+            return [EventPart(text=text)]
 
-        originalText = text
         try:
-            self._parts = []
-
-            if not text.startswith("{"):
-                # Consume everything up to the first {
-                tagStartIdx = text.index("{")
-                self._parts.append(EventPart(text=text[:tagStartIdx]))
-                text = text[tagStartIdx:]
-
-            # Then try to parse the rest of the line
-            self._parts.extend(
-                [
-                    EventPart(tags=Tags.parse(tagPart), text=textPart)
-                    for tagPart, textPart in re.findall(r"\{([^\}]*)\}([^\{]*)", text)
-                ]
-            )
+            parts = []
+
+            # Consume everything up to the first {
+            tagStartIdx = text.index("{")
+            if tagStartIdx != 0:
+                parts.append(EventPart(text=text[:tagStartIdx]))
+
+            # Then walk the rest of the line once, block by block
+            # An unterminated { and everything after it is dropped
+            while tagStartIdx != -1:
+                tagEndIdx = text.find("}", tagStartIdx + 1)
+                if tagEndIdx == -1:
+                    break
+
+                nextTagStartIdx = text.find("{", tagEndIdx + 1)
+                textEndIdx = nextTagStartIdx if nextTagStartIdx != -1 else len(text)
+
+                parts.append(
+                    EventPart(
+                        tags=Tags._parseSlice(text, tagStartIdx + 1, tagEndIdx),
+                        text=text[tagEndIdx + 1 : textEndIdx],
+                    )
+                )
+                tagStartIdx = nextTagStartIdx
         except:
-            self._parts = [EventPart(text=originalText)]
+            return [EventPart(text=text)]
+
+        return parts
@@ -0,0 +1,336 @@
+import functools
+import re
+import sys
+from array import array
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+from pyass.enum import EventFormat
+from pyass.event import Event
+from pyass.retime import Retimable
+from pyass.section import EventsSection
+from pyass.timestamp import Timestamp
+
+EventTable = TypeVar("EventTable", bound="EventTable")
+
+
+class EventTable(Retimable):
+    # A columnar equivalent of EventsSection for holding many events cheaply
+    # Numeric fields live in typed arrays and repeated strings are interned,
+    # while the text of each event is kept unparsed until the event is materialized
+    __slots__ = (
+        "format",
+        "layer",
+        "start",
+        "end",
+        "style",
+        "name",
+        "marginL",
+        "marginR",
+        "marginV",
+        "effect",
+        "text",
+        "_unknownRawTexts",
+        "_sourceLines",
+    )
+
+    def __init__(self, events: Iterable[Event] = []):
+        # Indices into EventTable._formats()
+        self.format = array("b")
+        self.layer = array("q")
+        # In centiseconds
+        self.start = array("q")
+        self.end = array("q")
+        self.style: list[str] = []
+        self.name: list[str] = []
+        self.marginL = array("q")
+        self.marginR = array("q")
+        self.marginV = array("q")
+        self.effect: list[str] = []
+        self.text: list[str] = []
+
+        # Rows that could not be parsed, kept as their raw line
+        self._unknownRawTexts: dict[int, str] = {}
+
+        # Rows read from a line they would not be printed as (e.g. 0:00:00.5),
+        # kept with the row they were read into
+        # They are printed as read for as long as the row is unchanged,
+        # the same way events are
+        self._sourceLines: dict[int, tuple[str, tuple]] = {}
+
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __getitem__(self, i: int) -> Event:
+        i = self._index(i)
+
+        rawText = self._unknownRawTexts.get(i)
+        if rawText is not None:
+            return Event.parse(rawText)
+
+        ret = Event(
+            format=EventTable._formats()[self.format[i]],
+            layer=self.layer[i],
+            start=Timestamp(self.start[i]),
+            end=Timestamp(self.end[i]),
+            style=self.style[i],
+            name=self.name[i],
+            marginL=self.marginL[i],
+            marginR=self.marginR[i],
+            marginV=self.marginV[i],
+            effect=self.effect[i],
+            text=self.text[i],
+        )
+
+        source = self._sourceLines.get(i)
+        if source is not None and source[1] == self._row(i):
+            ret._source = (source[0], ret._printedFields())
+
+        return ret
+
+    def __setitem__(self, i: int, event: Event) -> None:
+        i = self._index(i)
+
+        if event._unknownRawText:
+            self._unknownRawTexts[i] = event._unknownRawText
+            return
+
+        self._unknownRawTexts.pop(i, None)
+        self._sourceLines.pop(i, None)
+        self.format[i] = EventTable._formats().index(event.format)
+        self.layer[i] = event.layer
+        self.start[i] = Timestamp(event.start).centiseconds
+        self.end[i] = Timestamp(event.end).centiseconds
+        self.style[i] = sys.intern(event.style)
+        self.name[i] = sys.intern(event.name)
+        self.marginL[i] = event.marginL
+        self.marginR[i] = event.marginR
+        self.marginV[i] = event.marginV
+        self.effect[i] = sys.intern(event.effect)
+        self.text[i] = event.text
+
+        if event._source is not None:
+            self._keepSourceLine(i, str(event))
+
+    def __iter__(self) -> Iterator[Event]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EventTable):
+            return NotImplemented
+
+        return str(self) == str(other)
+
+    def __str__(self) -> str:
+        return "\n".join(self.iterLines()) + "\n"
+
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{EventsSection.header()}]"
+        yield EventsSection.preamble()
+        for i in range(len(self)):
+            yield self._formatRow(i)
+
+    def append(self, event: Event) -> None:
+        self._appendRow(
+            EventTable._formats().index(event.format),
+            event.layer,
+            Timestamp(event.start).centiseconds,
+            Timestamp(event.end).centiseconds,
+            event.style,
+            event.name,
+            event.marginL,
+            event.marginR,
+            event.marginV,
+            event.effect,
+            event.text,
+        )
+
+        if event._unknownRawText:
+            self._unknownRawTexts[len(self) - 1] = event._unknownRawText
+        elif event._source is not None:
+            self._keepSourceLine(len(self) - 1, str(event))
+
+    def appendLine(self, line: str) -> None:
+        # Same as append(Event.parse(line)), without creating the intermediate event
+        try:
+            formatStr, rest = line.split(":", 1)
+            format = EventTable._formatIndices()[formatStr]
+
+            (
+                layerStr,
+                startStr,
+                endStr,
+                style,
+                name,
+                marginLStr,
+                marginRStr,
+                marginVStr,
+                effect,
+                text,
+            ) = rest.strip().split(",", 9)
+            row = (
+                format,
+                int(layerStr),
+                Timestamp._parseCentiseconds(startStr),
+                Timestamp._parseCentiseconds(endStr),
+                style,
+                name,
+                int(marginLStr),
+                int(marginRStr),
+                int(marginVStr),
+                effect,
+                text,
+            )
+        except:
+            self.append(Event.parse(line))
+            return
+
+        self._appendRow(*row)
+        self._keepSourceLine(len(self) - 1, line)
+
+    def clear(self) -> None:
+        for column in self._columns():
+            del column[:]
+        self._unknownRawTexts.clear()
+        self._sourceLines.clear()
+
+    @staticmethod
+    def parse(s: str) -> EventTable:
+        lines = s.splitlines()
+        header = lines[0].removeprefix("[").removesuffix("]")
+
+        # Trailing blank line is dropped, same as EventsSection
+        body = lines[1:]
+        if body and not body[-1]:
+            body.pop()
+
+        if (
+            header != EventsSection.header()
+            or not body
+            or body[0] != EventsSection.preamble()
+        ):
+            raise ValueError
+
+        return EventTable.fromLines(body[1:])
+
+    @staticmethod
+    def fromLines(lines: Iterable[str]) -> EventTable:
+        # Takes the event lines of a section, e.g. as yielded by Section._iterItemLines
+        ret = EventTable()
+        for line in lines:
+            ret.appendLine(line)
+
+        return ret
+
+    @staticmethod
+    def fromEventsSection(section: Sequence[Event]) -> EventTable:
+        return EventTable(section)
+
+    def toEventsSection(self) -> EventsSection:
+        ret = EventsSection()
+        ret.extend(self)
+        return ret
+
+    def _appendRow(
+        self,
+        format: int,
+        layer: int,
+        start: int,
+        end: int,
+        style: str,
+        name: str,
+        marginL: int,
+        marginR: int,
+        marginV: int,
+        effect: str,
+        text: str,
+    ) -> None:
+        self.format.append(format)
+        self.layer.append(layer)
+        self.start.append(start)
+        self.end.append(end)
+        self.style.append(sys.intern(style))
+        self.name.append(sys.intern(name))
+        self.marginL.append(marginL)
+        self.marginR.append(marginR)
+        self.marginV.append(marginV)
+        self.effect.append(sys.intern(effect))
+        self.text.append(text)
+
+    def _mapTimes(self, f: Callable[[int], int]) -> None:
+        # Rows kept as raw lines are mapped too, but their columns are never read
+        self.start = array("q", map(f, self.start))
+        self.end = array("q", map(f, self.end))
+
+    def _scaleTagTimes(self, factor: float) -> None:
+        self.text = [Retimable._scaleTextTimes(text, factor) for text in self.text]
+
+    def _formatRow(self, i: int) -> str:
+        rawText = self._unknownRawTexts.get(i)
+        if rawText is not None:
+            return rawText
+
+        source = self._sourceLines.get(i)
+        if source is not None and source[1] == self._row(i):
+            return source[0]
+
+        # Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+        return f"{EventTable._formats()[self.format[i]]}: {self.layer[i]},{Timestamp._formatCentiseconds(self.start[i])},{Timestamp._formatCentiseconds(self.end[i])},{self.style[i]},{self.name[i]},{self.marginL[i]},{self.marginR[i]},{self.marginV[i]},{self.effect[i]},{self.text[i]}"
+
+    def _keepSourceLine(self, i: int, line: str) -> None:
+        # Almost every line is written the way its row prints, which the pattern
+        # tells far more cheaply than printing the row
+        if EventTable._canonicalLine().fullmatch(line) is None and line != (
+            self._formatRow(i)
+        ):
+            self._sourceLines[i] = (line, self._row(i))
+
+    def _row(self, i: int) -> tuple:
+        return tuple(column[i] for column in self._columns())
+
+    def _columns(self) -> list[array | list[str]]:
+        return [
+            self.format,
+            self.layer,
+            self.start,
+            self.end,
+            self.style,
+            self.name,
+            self.marginL,
+            self.marginR,
+            self.marginV,
+            self.effect,
+            self.text,
+        ]
+
+    def _index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("EventTable index out of range")
+
+        return i
+
+    @staticmethod
+    @functools.cache
+    def _formats() -> tuple[EventFormat, ...]:
+        return tuple(EventFormat)
+
+    @staticmethod
+    @functools.cache
+    def _canonicalLine() -> re.Pattern:
+        # Lines of the form _formatRow prints, for times that are not negative
+        int_ = r"(?:0|-?[1-9][0-9]*)"
+        time = r"(?:[0-9]|[1-9][0-9]+):[0-5][0-9]:[0-5][0-9]\.[0-9][0-9]"
+        return re.compile(
+            rf"[A-Za-z]+: {int_},{time},{time},[^,]*,[^,]*,{int_},{int_},{int_},[^,]*,(?:.*\S)?"
+        )
+
+    @staticmethod
+    @functools.cache
+    def _formatIndices() -> dict[str, int]:
+        return {e.value: i for i, e in enumerate(EventFormat)}
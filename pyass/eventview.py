@@ -0,0 +1,359 @@
+import functools
+import mmap
+from array import array
+from datetime import timedelta
+from typing import Iterator, Optional, TypeVar
+
+from pyass.enum import EventFormat
+from pyass.event import Event
+from pyass.section import EventsSection
+from pyass.timestamp import Timestamp
+
+EventView = TypeVar("EventView", bound="EventView")
+EventViewList = TypeVar("EventViewList", bound="EventViewList")
+
+Buffer = str | bytes | bytearray | mmap.mmap
+
+
+class EventView:
+    # An event backed by a line of a larger buffer, which is never copied
+    # The field boundaries are found on the first field access,
+    # and each field is only decoded when it is read
+    # Setting a field promotes the view to a full Event, which it reads from after
+    __slots__ = ("_buffer", "_start", "_end", "_encoding", "_bounds", "_owner", "_row")
+
+    def __init__(
+        self,
+        buffer: Buffer,
+        start: int,
+        end: int,
+        encoding: str = "utf-8",
+        owner: Optional[EventViewList] = None,
+        row: int = 0,
+    ) -> None:
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        self._encoding = encoding
+
+        # Offsets of the : after the format and of the 9 commas after it,
+        # or None if they have not been looked for yet
+        self._bounds: Optional[tuple[int, ...]] = None
+
+        # Views of a list are promoted into the list, so that it and its other
+        # views of the same row see the change
+        # Views on their own are promoted into a list of their own
+        self._owner = owner
+        self._row = row
+
+    def __str__(self) -> str:
+        event = self._promoted()
+        if event is not None:
+            return str(event)
+
+        # Events print the line they were parsed from, except for blank lines
+        if self._start == self._end:
+            return str(self.toEvent())
+
+        return self._decode(self._start, self._end)
+
+    def __repr__(self) -> str:
+        return f"EventView({str(self)!r})"
+
+    @property
+    def format(self) -> EventFormat:
+        return self._field("format", 0, EventFormat)
+
+    @format.setter
+    def format(self, v: EventFormat) -> None:
+        self._promote().format = v
+
+    @property
+    def layer(self) -> int:
+        return self._field("layer", 1, int)
+
+    @layer.setter
+    def layer(self, v: int) -> None:
+        self._promote().layer = v
+
+    @property
+    def start(self) -> timedelta | Timestamp:
+        return self._field("start", 2, Timestamp.parse)
+
+    @start.setter
+    def start(self, v: timedelta | Timestamp) -> None:
+        self._promote().start = v
+
+    @property
+    def end(self) -> timedelta | Timestamp:
+        return self._field("end", 3, Timestamp.parse)
+
+    @end.setter
+    def end(self, v: timedelta | Timestamp) -> None:
+        self._promote().end = v
+
+    @property
+    def style(self) -> str:
+        return self._field("style", 4, str)
+
+    @style.setter
+    def style(self, v: str) -> None:
+        self._promote().style = v
+
+    @property
+    def name(self) -> str:
+        return self._field("name", 5, str)
+
+    @name.setter
+    def name(self, v: str) -> None:
+        self._promote().name = v
+
+    @property
+    def marginL(self) -> int:
+        return self._field("marginL", 6, int)
+
+    @marginL.setter
+    def marginL(self, v: int) -> None:
+        self._promote().marginL = v
+
+    @property
+    def marginR(self) -> int:
+        return self._field("marginR", 7, int)
+
+    @marginR.setter
+    def marginR(self, v: int) -> None:
+        self._promote().marginR = v
+
+    @property
+    def marginV(self) -> int:
+        return self._field("marginV", 8, int)
+
+    @marginV.setter
+    def marginV(self, v: int) -> None:
+        self._promote().marginV = v
+
+    @property
+    def effect(self) -> str:
+        return self._field("effect", 9, str)
+
+    @effect.setter
+    def effect(self, v: str) -> None:
+        self._promote().effect = v
+
+    @property
+    def text(self) -> str:
+        return self._field("text", 10, str)
+
+    @text.setter
+    def text(self, v: str) -> None:
+        self._promote().text = v
+
+    def toEvent(self) -> Event:
+        # Promoted views give the event they were promoted to
+        event = self._promoted()
+        if event is not None:
+            return event
+
+        return Event.parse(self._decode(self._start, self._end))
+
+    def _promoted(self) -> Optional[Event]:
+        if self._owner is None:
+            return None
+
+        return self._owner._promoted.get(self._row)
+
+    def _promote(self) -> Event:
+        if self._owner is None:
+            self._owner = EventViewList(self._buffer, self._encoding)
+            self._owner._appendLine(self._start, self._end)
+            self._row = 0
+
+        return self._owner.promote(self._row)
+
+    def _field(self, name: str, i: int, convert):
+        event = self._promoted()
+        if event is not None:
+            return getattr(event, name)
+
+        # Fields that cannot be read fall back to whatever Event.parse makes of them
+        # Other fields of the line are still read, where Event.parse would drop them
+        try:
+            bounds = self._getBounds()
+            if i == 0:
+                return convert(self._decode(self._start, bounds[0]))
+
+            # Same as the strip Event.parse applies to everything after the :
+            s = self._decode(
+                bounds[i - 1] + 1, bounds[i] if i < len(bounds) else self._end
+            )
+            if i == 1:
+                s = s.lstrip()
+            elif i == 10:
+                s = s.rstrip()
+
+            return convert(s)
+        except:
+            return getattr(self.toEvent(), name)
+
+    def _getBounds(self) -> tuple[int, ...]:
+        if self._bounds is None:
+            buffer, start, end = self._buffer, self._start, self._end
+            if isinstance(buffer, str):
+                bounds = [buffer.find(":", start, end)]
+                while len(bounds) < 10 and bounds[-1] != -1:
+                    bounds.append(buffer.find(",", bounds[-1] + 1, end))
+            else:
+                bounds = [buffer.find(b":", start, end)]
+                while len(bounds) < 10 and bounds[-1] != -1:
+                    bounds.append(buffer.find(b",", bounds[-1] + 1, end))
+
+            if bounds[-1] == -1:
+                raise ValueError
+
+            self._bounds = tuple(bounds)
+
+        return self._bounds
+
+    def _decode(self, start: int, end: int) -> str:
+        s = self._buffer[start:end]
+        return s if isinstance(s, str) else s.decode(self._encoding)
+
+
+class EventViewList:
+    # The events of a document, kept as line offsets into the document itself
+    # Loading only finds where each line starts and ends, which is much cheaper
+    # than parsing
+    # Events are read through EventView, and promoted to an Event to be changed
+    # Byte buffers must use an ASCII compatible encoding (e.g. UTF-8),
+    # so that field separators can be found without decoding the line
+    __slots__ = ("_buffer", "_encoding", "_starts", "_ends", "_promoted")
+
+    def __init__(self, buffer: Buffer = "", encoding: str = "utf-8") -> None:
+        self._buffer = buffer
+        self._encoding = encoding
+        self._starts = array("q")
+        self._ends = array("q")
+
+        # Rows that have been replaced by a full event
+        self._promoted: dict[int, Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, i: int) -> EventView | Event:
+        i = self._index(i)
+
+        event = self._promoted.get(i)
+        if event is not None:
+            return event
+
+        return EventView(
+            self._buffer, self._starts[i], self._ends[i], self._encoding, self, i
+        )
+
+    def __setitem__(self, i: int, event: Event) -> None:
+        self._promoted[self._index(i)] = event
+
+    def __iter__(self) -> Iterator[EventView | Event]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self) -> str:
+        return "\n".join(self.iterLines()) + "\n"
+
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{EventsSection.header()}]"
+        yield EventsSection.preamble()
+        for item in self:
+            yield str(item)
+
+    def promote(self, i: int) -> Event:
+        # The event at i, parsed into an Event that replaces the view and can be edited
+        item = self[i]
+        if isinstance(item, EventView):
+            item = self._promoted[self._index(i)] = item.toEvent()
+
+        return item
+
+    def toEventsSection(self) -> EventsSection:
+        ret = EventsSection()
+        ret.extend(
+            [item.toEvent() if isinstance(item, EventView) else item for item in self]
+        )
+        return ret
+
+    @staticmethod
+    def fromBuffer(buffer: Buffer, encoding: str = "utf-8") -> EventViewList:
+        # Takes a whole document, or just its [Events] section
+        # Mirrors what iterEvents would yield, without copying lines out of the buffer
+        ret = EventViewList(buffer, encoding)
+
+        # The separators are typed per branch, as str and bytes cannot be mixed
+        if isinstance(buffer, str):
+            findNewline = functools.partial(buffer.find, "\n")
+            cr, openBracket, closeBracket = "\r", "[", "]"
+            header = f"[{EventsSection.header()}]"
+            preamble = EventsSection.preamble()
+        else:
+            findNewline = functools.partial(buffer.find, b"\n")
+            cr, openBracket, closeBracket = b"\r", b"[", b"]"
+            header = f"[{EventsSection.header()}]".encode(encoding)
+            preamble = EventsSection.preamble().encode(encoding)
+
+        isFirstLine = True
+        isInSection = False
+        hasPreamble = False
+        pendingStart = pendingEnd = -1
+
+        start = 0
+        n = len(buffer)
+        while start < n:
+            end = findNewline(start)
+            nextStart = end + 1
+            if end == -1:
+                end = nextStart = n
+            if end > start and buffer[end - 1 : end] == cr:
+                end -= 1
+
+            if isFirstLine or (
+                buffer[start : start + 1] == openBracket
+                and buffer[end - 1 : end] == closeBracket
+            ):
+                # The blank line separating two sections does not belong to either
+                if pendingEnd > pendingStart:
+                    ret._appendLine(pendingStart, pendingEnd)
+
+                isFirstLine = False
+                isInSection = buffer[start:end] == header
+                hasPreamble = False
+                pendingStart = pendingEnd = -1
+            elif not isInSection:
+                pass
+            elif not hasPreamble:
+                # Sections with an unexpected format are parsed as unknown sections
+                isInSection = buffer[start:end] == preamble
+                hasPreamble = True
+            else:
+                if pendingStart != -1:
+                    ret._appendLine(pendingStart, pendingEnd)
+                pendingStart, pendingEnd = start, end
+
+            start = nextStart
+
+        if pendingEnd > pendingStart:
+            ret._appendLine(pendingStart, pendingEnd)
+
+        return ret
+
+    def _appendLine(self, start: int, end: int) -> None:
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def _index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("EventViewList index out of range")
+
+        return i
@@ -0,0 +1,182 @@
+import math
+from operator import itemgetter
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    # Items keyed on half-open [start, end) integer intervals
+    # Most items live in arrays sorted by start, with an implicit augmented binary tree
+    # laid over them (as in cgranges), so overlap queries take O(log n + k)
+    # Additions are buffered and removals are recorded as tombstones, and both are
+    # folded into the arrays once there are O(sqrt(n)) of them
+    __slots__ = (
+        "_starts",
+        "_ends",
+        "_items",
+        "_maxEnds",
+        "_maxLevel",
+        "_pending",
+        "_removed",
+        "_removedCount",
+    )
+
+    def __init__(self, intervals: Iterable[tuple[int, int, T]] = ()) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._items: list[T] = []
+        self._maxEnds: list[int] = []
+        self._maxLevel = 0
+
+        self._pending: list[tuple[int, int, T]] = list(intervals)
+        # Number of times each item (by id) has been removed from the arrays
+        self._removed: dict[int, int] = {}
+        self._removedCount = 0
+
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._items) - self._removedCount + len(self._pending)
+
+    def add(self, start: int, end: int, item: T) -> None:
+        self._pending.append((start, end, item))
+        self._maybeRebuild()
+
+    def remove(self, item: T) -> None:
+        # Items are matched by identity, and must have been added before
+        pending = self._pending
+        for i in range(len(pending) - 1, -1, -1):
+            if pending[i][2] is item:
+                del pending[i]
+                return
+
+        self._removed[id(item)] = self._removed.get(id(item), 0) + 1
+        self._removedCount += 1
+        self._maybeRebuild()
+
+    def overlapping(self, start: int, end: int) -> list[T]:
+        # Items whose interval intersects [start, end), in order of their start
+        if start >= end:
+            return []
+
+        hits = self._overlappingIndices(start, end)
+
+        rows = []
+        removed = dict(self._removed)
+        for i in hits:
+            item = self._items[i]
+            if removed:
+                count = removed.get(id(item))
+                if count:
+                    removed[id(item)] = count - 1
+                    continue
+
+            rows.append((self._starts[i], item))
+
+        pendingRows = [
+            (rowStart, item)
+            for rowStart, rowEnd, item in self._pending
+            if rowStart < end and start < rowEnd
+        ]
+        if pendingRows:
+            rows.extend(pendingRows)
+            rows.sort(key=itemgetter(0))
+
+        return [item for _, item in rows]
+
+    def _overlappingIndices(self, start: int, end: int) -> list[int]:
+        n = len(self._items)
+        if n == 0:
+            return []
+
+        starts, ends, maxEnds = self._starts, self._ends, self._maxEnds
+        hits = []
+
+        # (level, node, whether the left subtree has already been visited)
+        stack = [(self._maxLevel, (1 << self._maxLevel) - 1, False)]
+        while stack:
+            k, x, isVisited = stack.pop()
+            if k <= 3:
+                # Small subtrees are cheaper to scan directly
+                i = x >> k << k
+                i1 = min(i + (1 << (k + 1)) - 1, n)
+                while i < i1 and starts[i] < end:
+                    if start < ends[i]:
+                        hits.append(i)
+                    i += 1
+            elif not isVisited:
+                stack.append((k, x, True))
+                y = x - (1 << (k - 1))
+                if y >= n or maxEnds[y] > start:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] < end:
+                if start < ends[x]:
+                    hits.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+
+        hits.sort()
+        return hits
+
+    def _maybeRebuild(self) -> None:
+        # A rebuild costs about as much as scanning 4 * sqrt(n) pending rows per query
+        if len(self._pending) + self._removedCount > max(
+            64, 4 * math.isqrt(len(self._items))
+        ):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        rows = list(zip(self._starts, self._ends, self._items))
+        if self._removed:
+            removed = self._removed
+            kept = []
+            for row in rows:
+                count = removed.get(id(row[2]))
+                if count:
+                    removed[id(row[2])] = count - 1
+                else:
+                    kept.append(row)
+            rows = kept
+
+        # Already sorted apart from the pending rows, which Timsort handles in one merge
+        rows.extend(self._pending)
+        rows.sort(key=itemgetter(0))
+
+        self._starts = [row[0] for row in rows]
+        self._ends = [row[1] for row in rows]
+        self._items = [row[2] for row in rows]
+        self._pending = []
+        self._removed = {}
+        self._removedCount = 0
+        self._augment()
+
+    def _augment(self) -> None:
+        # Nodes at level k sit at indices whose lowest k bits are set,
+        # and hold the max end over their whole subtree
+        ends = self._ends
+        n = len(ends)
+        maxEnds = list(ends)
+
+        last = 0
+        lastI = 0
+        if n:
+            lastI = (n - 1) & ~1
+            last = ends[lastI]
+
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                maxEnds[i] = max(
+                    ends[i], maxEnds[i - x], maxEnds[i + x] if i + x < n else last
+                )
+
+            # The rightmost node of this level may have children past the end
+            lastI = lastI - x if lastI >> k & 1 else lastI + x
+            if lastI < n and maxEnds[lastI] > last:
+                last = maxEnds[lastI]
+
+            k += 1
+
+        self._maxEnds = maxEnds
+        self._maxLevel = k - 1
@@ -6,7 +6,7 @@ from pyass.float import _float
 Position = TypeVar("Position", bound="Position")
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     x: float
     y: float
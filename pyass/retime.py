@@ -0,0 +1,85 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Callable, Optional
+
+from pyass.event import Event
+from pyass.timestamp import Timestamp
+
+# Tags that carry timing arguments, see Tag.scaleTimes
+_timingTagPattern = re.compile(r"\\(?:move|fad|t|k|K)")
+
+
+class Retimable(ABC):
+    # Bulk operations on the start and end times of a collection of events
+    # Times are handled as integer centiseconds, and subclasses only have to map a
+    # function over all of them
+    @abstractmethod
+    def _mapTimes(self, f: Callable[[int], int]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _scaleTagTimes(self, factor: float) -> None:
+        raise NotImplementedError
+
+    def shift(self, delta: timedelta | Timestamp) -> None:
+        d = Timestamp(delta).centiseconds
+        self._mapTimes(lambda t: t + d)
+
+    def scale(
+        self,
+        factor: float,
+        origin: timedelta | Timestamp = Timestamp(),
+        scaleTags: bool = False,
+    ) -> None:
+        # Tag times are relative to the start of their event, so the origin does not apply
+        o = Timestamp(origin).centiseconds
+        self._mapTimes(lambda t: o + round((t - o) * factor))
+
+        if scaleTags:
+            self._scaleTagTimes(factor)
+
+    def convertFramerate(
+        self, fromFps: float, toFps: float, scaleTags: bool = False
+    ) -> None:
+        # Every frame keeps its number, e.g. 23.976 -> 25 fps shortens everything
+        # Pass fractions.Fraction(24000, 1001) and friends for exact NTSC rates
+        self.scale(fromFps / toFps, scaleTags=scaleTags)
+
+    def clamp(
+        self,
+        lo: Optional[timedelta | Timestamp] = None,
+        hi: Optional[timedelta | Timestamp] = None,
+    ) -> None:
+        loCs = Timestamp(lo).centiseconds if lo is not None else None
+        hiCs = Timestamp(hi).centiseconds if hi is not None else None
+
+        if loCs is not None and hiCs is not None:
+            if loCs > hiCs:
+                raise ValueError
+
+            self._mapTimes(lambda t: min(max(t, loCs), hiCs))
+        elif loCs is not None:
+            self._mapTimes(lambda t: max(t, loCs))
+        elif hiCs is not None:
+            self._mapTimes(lambda t: min(t, hiCs))
+
+    def round(self, granularity: timedelta | Timestamp) -> None:
+        # Rounds half up to the nearest multiple of granularity
+        g = Timestamp(granularity).centiseconds
+        if g <= 0:
+            raise ValueError
+
+        self._mapTimes(lambda t: (t + g // 2) // g * g)
+
+    @staticmethod
+    def _scaleTextTimes(text: str, factor: float) -> str:
+        # Texts without timing tags are returned untouched instead of being re-serialized
+        if not _timingTagPattern.search(text):
+            return text
+
+        parts = Event._parts_from_text(text)
+        for part in parts:
+            part.tags.scaleTimes(factor)
+
+        return "".join([str(part) for part in parts])
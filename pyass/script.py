@@ -1,20 +1,44 @@
 from dataclasses import dataclass
-from typing import IO, Sequence, TypeVar
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, Sequence, TypeVar
 
 from pyass.event import Event
 from pyass.section import (
     AegisubGarbageSection,
     EventsSection,
+    LazySection,
     ScriptInfoSection,
     Section,
     StylesSection,
 )
 from pyass.style import Style
+from pyass.trackedlist import TrackedList
 
 Script = TypeVar("Script", bound="Script")
 SectionT = TypeVar("SectionT", bound=Section)
 
 
+class _SectionList(TrackedList[Section]):
+    # Section type -> section, shared with the script the list belongs to
+    # Emptied whenever the list changes
+    # Unpickling adds items before the instance's own map is restored,
+    # which only ever empties this empty default
+    _byType: dict[type[Section], Any] = {}
+
+    def __init__(self, iterable: Iterable[Section] = ()) -> None:
+        self._byType = {}
+        super().__init__(iterable)
+
+    def _onAdd(self, item: Section) -> None:
+        self._byType.clear()
+
+    def _onRemove(self, item: Section) -> None:
+        self._byType.clear()
+
+    def _onReorder(self) -> None:
+        self._byType.clear()
+
+
 @dataclass
 class Script:
     sections: list[Section]
@@ -43,36 +67,66 @@ class Script:
         self.sections.append(StylesSection(styles))
         self.sections.append(EventsSection(events))
 
+    def __setattr__(self, name: str, value) -> None:
+        if name == "sections":
+            # Copied into a list that knows when it changes, so the sections of a
+            # script are changed through script.sections, not the list it was given
+            if not isinstance(value, _SectionList):
+                value = _SectionList(value)
+
+            # Filled in as the section properties are read
+            self._sectionsByType = value._byType
+
+        object.__setattr__(self, name, value)
+
     def __str__(self) -> str:
+        return self.dumps()
+
+    def iterLines(self, workers: int = 1) -> Iterator[str]:
+        # The lines of the whole script, without line endings
+        # Sections are produced one at a time, so the output is never held in memory
+        # With more than one worker, events are printed in that many processes
         excludeIfEmptySections = [AegisubGarbageSection]
-        sectionsToPrint = [
-            section
-            for section in self.sections
-            if section.header()
-            not in [SectionType.header() for SectionType in excludeIfEmptySections]
-            or section
-        ]
-        return "\n".join([str(section) for section in sectionsToPrint])
+        isFirstSection = True
+        for section in self.sections:
+            if (
+                section.header()
+                in [SectionType.header() for SectionType in excludeIfEmptySections]
+                and not section
+            ):
+                continue
+
+            # Sections are separated by a blank line
+            if not isFirstSection:
+                yield ""
+            isFirstSection = False
+
+            if isinstance(section, EventsSection):
+                yield from section.iterLines(workers)
+            else:
+                yield from section.iterLines()
 
     @staticmethod
-    def parse(s: str) -> Script:
-        lines = s.splitlines()
-        currSectionLines = []
+    def parse(s: str, lazy: bool = False, workers: int = 1) -> Script:
+        return Script.parseLines(s.splitlines(), lazy, workers)
 
+    @staticmethod
+    def parseLines(
+        lines: Iterable[str], lazy: bool = False, workers: int = 1
+    ) -> Script:
+        # Lines without their line endings, as str.splitlines would split them
+        # With more than one worker, events are parsed in that many processes
         ret = Script()
         ret.sections.clear()
-
-        for line in lines:
-            if line.startswith("[") and line.endswith("]"):
-                if currSectionLines:
-                    ret.sections.append(Section.parse("\n".join(currSectionLines)))
-                    currSectionLines.clear()
-
-            currSectionLines.append(line)
-
-        if currSectionLines:
-            ret.sections.append(Section.parse("\n".join(currSectionLines)))
-
+        if lazy or workers <= 1:
+            ret.sections.extend(Section.iterSections(lines, lazy))
+        else:
+            ret.sections.extend(
+                section.materialize(workers)
+                if isinstance(section, LazySection)
+                else section
+                for section in Section.iterSections(lines, True)
+            )
         return ret
 
     @property
@@ -107,14 +161,34 @@ class Script:
     def events(self, s: Sequence[Event]):
         self._set_section(EventsSection(s))
 
-    def dump(self, fp: IO[str]) -> None:
-        fp.write(self.dumps())
+    def dump(self, fp: IO[str], workers: int = 1) -> None:
+        # Written a batch of lines at a time, far cheaper than one write per line,
+        # especially when the file compresses or encodes what it is given
+        lines = self.iterLines(workers)
+        while batch := list(islice(lines, 1024)):
+            fp.write("\n".join(batch) + "\n")
 
-    def dumps(self) -> str:
-        return str(self)
+    def dumps(self, workers: int = 1) -> str:
+        return "".join([line + "\n" for line in self.iterLines(workers)])
 
     def _get_section_by_type(self, t: type[SectionT]) -> SectionT:
-        for section in self.sections:
+        try:
+            return self._sectionsByType[t]
+        except KeyError:
+            pass
+
+        # Finding the section may materialize it, which changes sections
+        section = self._find_section_by_type(t)
+        self._sectionsByType[t] = section
+        return section
+
+    def _find_section_by_type(self, t: type[SectionT]) -> SectionT:
+        for i, section in enumerate(self.sections):
+            if isinstance(section, LazySection) and section.header() == t.header():
+                # Parse lazily loaded sections on first access
+                section = section.materialize()
+                self.sections[i] = section
+
             if isinstance(section, t):
                 return section
 
@@ -122,7 +196,9 @@ class Script:
 
     def _set_section(self, s: Section):
         for i, section in enumerate(self.sections):
-            if isinstance(s, type(section)):
+            if isinstance(s, type(section)) or (
+                isinstance(section, LazySection) and section.header() == s.header()
+            ):
                 self.sections[i] = s
                 return
 
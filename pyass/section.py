@@ -1,9 +1,20 @@
+import itertools
+import multiprocessing
+import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Sequence, TypeVar
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TypeVar
 
+from pyass.enum import Wrapping
 from pyass.event import Event
+from pyass.intervalindex import IntervalIndex
+from pyass.retime import Retimable
 from pyass.style import Style
+from pyass.timestamp import Timestamp
+from pyass.trackedlist import TrackedList
 
 Section = TypeVar("Section", bound="Section")
 
@@ -13,15 +24,106 @@ class Section(ABC):
     def header() -> str:
         raise NotImplementedError
 
+    def __str__(self) -> str:
+        return "\n".join(self.iterLines()) + "\n"
+
+    @abstractmethod
+    def iterLines(self) -> Iterator[str]:
+        # The lines of the section, without line endings
+        raise NotImplementedError
+
     @staticmethod
-    def parse(s: str) -> Section:
+    def parse(s: str, lazy: bool = False) -> Section:
         lines = s.splitlines()
-        header = lines[0].removeprefix("[").removesuffix("]")
+        return Section._parseLines(lines[0], lines[1:], lazy)
+
+    @staticmethod
+    def _parseLines(
+        headerLine: str, lines: Sequence[str], lazy: bool = False
+    ) -> Section:
+        header = headerLine.removeprefix("[").removesuffix("]")
+
+        # Unknown sections are kept as raw lines anyway, so there is nothing to defer
+        if lazy and header in [
+            SectionType.header() for SectionType in Section.knownSectionTypes()
+        ]:
+            return LazySection._parse(header, lines)
+
+        return Section._parseBody(header, lines)
+
+    @staticmethod
+    def _parseBody(header: str, lines: Sequence[str]) -> Section:
         for SectionType in Section.knownSectionTypes():
             if header == SectionType.header():
-                return SectionType._parse(header, lines[1:])
+                return SectionType._parse(header, lines)
+
+        return UnknownSection._parse(header, lines)
+
+    @staticmethod
+    def iterSections(lines: Iterable[str], lazy: bool = False) -> Iterator[Section]:
+        # Every line is handed to its section as is, so the document is only split once
+        # Only the lines of the current section are held in memory at any time
+        currHeaderLine: Optional[str] = None
+        currSectionLines: list[str] = []
+        for line in lines:
+            if currHeaderLine is None:
+                currHeaderLine = line
+            elif line.startswith("[") and line.endswith("]"):
+                yield Section._fromLines(currHeaderLine, currSectionLines, lazy)
+                currHeaderLine = line
+                currSectionLines = []
+            else:
+                currSectionLines.append(line)
 
-        return UnknownSection._parse(header, lines[1:])
+        if currHeaderLine is not None:
+            yield Section._fromLines(currHeaderLine, currSectionLines, lazy)
+
+    @staticmethod
+    def _fromLines(headerLine: str, lines: list[str], lazy: bool) -> Section:
+        # The blank line separating two sections does not belong to either
+        if lines and not lines[-1]:
+            lines.pop()
+
+        return Section._parseLines(headerLine, lines, lazy)
+
+    @staticmethod
+    def _iterItemLines(
+        lines: Iterable[str], header: str, preamble: str
+    ) -> Iterator[str]:
+        # Yields the body lines of every section with the given header and preamble,
+        # mirroring what iterSections would pass to _parse without buffering a section
+        isFirstLine = True
+        isInSection = False
+        hasPreamble = False
+        pendingLine: Optional[str] = None
+
+        for line in lines:
+            if isFirstLine or (line.startswith("[") and line.endswith("]")):
+                # The blank line separating two sections does not belong to either
+                if pendingLine:
+                    yield pendingLine
+
+                isFirstLine = False
+                isInSection = line.removeprefix("[").removesuffix("]") == header
+                hasPreamble = False
+                pendingLine = None
+                continue
+
+            if not isInSection:
+                continue
+
+            if not hasPreamble:
+                # Sections with an unexpected format are parsed as unknown sections
+                isInSection = line == preamble
+                hasPreamble = True
+                continue
+
+            if pendingLine is not None:
+                yield pendingLine
+            pendingLine = line
+
+        if pendingLine:
+            yield pendingLine
 
     @staticmethod
     @abstractmethod
@@ -42,8 +144,9 @@ class UnknownSection(Section):
     actualHeader: str
     lines: list[str]
 
-    def __str__(self) -> str:
-        return "\n".join([f"[{self.actualHeader}]", *self.lines]) + "\n"
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{self.actualHeader}]"
+        yield from self.lines
 
     def header(self) -> str:
         return self.actualHeader
@@ -56,17 +159,86 @@ class UnknownSection(Section):
         self.lines.clear()
 
 
-class ScriptInfoSection(list[tuple[str, str]], Section):
-    def __str__(self) -> str:
-        return (
-            "\n".join(
-                [
-                    f"[{ScriptInfoSection.header()}]",
-                    *[f"{k}: {v}" if k else f"; {v}" for k, v in self],
-                ]
-            )
-            + "\n"
-        )
+@dataclass
+class LazySection(Section):
+    # A known section whose contents have not been parsed yet
+    # It is dumped verbatim until it is materialized into its actual section type
+    actualHeader: str
+    lines: list[str]
+
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{self.actualHeader}]"
+        yield from self.lines
+
+    def __bool__(self) -> bool:
+        return bool(self.lines)
+
+    def header(self) -> str:
+        return self.actualHeader
+
+    @staticmethod
+    def _parse(header: str, lines: Sequence[str]) -> Section:
+        return LazySection(header, list(lines))
+
+    def clear(self) -> None:
+        self.lines.clear()
+
+    def materialize(self, workers: int = 1) -> Section:
+        # Only events are worth parsing in parallel
+        if self.actualHeader == EventsSection.header():
+            return EventsSection._parse(self.actualHeader, self.lines, workers)
+
+        return Section._parseBody(self.actualHeader, self.lines)
+
+
+class _KeyValueSection(TrackedList[tuple[str, str]], Section):
+    # Keyed access to "Key: Value" lines, which stay in their original order
+    # When a key is repeated the last line wins, the same way libass reads them
+    # Key -> position of its last line, built on the first lookup
+    _keyIndex: Optional[dict[str, int]] = None
+    _derivedAttributes = ("_keyIndex",)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        i = self._getKeyIndex().get(key)
+        return default if i is None else self[i][1]
+
+    def set(self, key: str, value: str) -> None:
+        # Updates the line in place, or appends one if the key is missing
+        i = self._getKeyIndex().get(key)
+        if i is None:
+            self.append((key, value))
+        else:
+            # The key keeps its position, so the index stays valid
+            list.__setitem__(self, i, (key, value))
+
+    def _getKeyIndex(self) -> dict[str, int]:
+        if self._keyIndex is None:
+            # Comment lines have no key
+            self._keyIndex = {k: i for i, (k, _) in enumerate(self) if k}
+
+        return self._keyIndex
+
+    def _onAdd(self, item: tuple[str, str]) -> None:
+        # Appending keeps the positions valid, anything else may shift them
+        if self._keyIndex is not None:
+            if self[-1] is item:
+                if item[0]:
+                    self._keyIndex[item[0]] = len(self) - 1
+            else:
+                self._keyIndex = None
+
+    def _onRemove(self, item: tuple[str, str]) -> None:
+        self._keyIndex = None
+
+    def _onReorder(self) -> None:
+        self._keyIndex = None
+
+
+class ScriptInfoSection(_KeyValueSection):
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{ScriptInfoSection.header()}]"
+        for k, v in self:
+            yield f"{k}: {v}" if k else f"; {v}"
 
     @staticmethod
     def header() -> str:
@@ -94,15 +266,64 @@ class ScriptInfoSection(list[tuple[str, str]], Section):
 
         return ret
 
+    @property
+    def playResX(self) -> Optional[int]:
+        v = self.get("PlayResX")
+        return None if v is None else int(v)
 
-class AegisubGarbageSection(list[tuple[str, str]], Section):
-    def __str__(self) -> str:
-        return (
-            "\n".join(
-                [f"[{AegisubGarbageSection.header()}]", *[f"{k}: {v}" for k, v in self]]
-            )
-            + "\n"
-        )
+    @playResX.setter
+    def playResX(self, v: int) -> None:
+        self.set("PlayResX", str(v))
+
+    @property
+    def playResY(self) -> Optional[int]:
+        v = self.get("PlayResY")
+        return None if v is None else int(v)
+
+    @playResY.setter
+    def playResY(self, v: int) -> None:
+        self.set("PlayResY", str(v))
+
+    @property
+    def wrapStyle(self) -> Optional[Wrapping]:
+        v = self.get(self._wrapStyleKey())
+        return None if v is None else Wrapping(int(v))
+
+    @wrapStyle.setter
+    def wrapStyle(self, v: Wrapping) -> None:
+        self.set(self._wrapStyleKey(), str(v.value))
+
+    @property
+    def scaledBorderAndShadow(self) -> Optional[bool]:
+        v = self.get("ScaledBorderAndShadow")
+        return None if v is None else v.lower() == "yes"
+
+    @scaledBorderAndShadow.setter
+    def scaledBorderAndShadow(self, v: bool) -> None:
+        self.set("ScaledBorderAndShadow", "yes" if v else "no")
+
+    @property
+    def yCbCrMatrix(self) -> Optional[str]:
+        return self.get("YCbCr Matrix")
+
+    @yCbCrMatrix.setter
+    def yCbCrMatrix(self, v: str) -> None:
+        self.set("YCbCr Matrix", v)
+
+    def _wrapStyleKey(self) -> str:
+        # Aegisub writes WrapStyle, while older scripts (and pyass) use Wrap Style
+        index = self._getKeyIndex()
+        if "WrapStyle" not in index and "Wrap Style" in index:
+            return "Wrap Style"
+
+        return "WrapStyle"
+
+
+class AegisubGarbageSection(_KeyValueSection):
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{AegisubGarbageSection.header()}]"
+        for k, v in self:
+            yield f"{k}: {v}"
 
     @staticmethod
     def header() -> str:
@@ -124,19 +345,35 @@ class AegisubGarbageSection(list[tuple[str, str]], Section):
 
         return ret
 
+    @property
+    def videoFile(self) -> Optional[str]:
+        return self.get("Video File")
 
-class StylesSection(list[Style], Section):
-    def __str__(self) -> str:
-        return (
-            "\n".join(
-                [
-                    f"[{StylesSection.header()}]",
-                    StylesSection.preamble(),
-                    *[str(style) for style in self],
-                ]
-            )
-            + "\n"
-        )
+    @videoFile.setter
+    def videoFile(self, v: str) -> None:
+        self.set("Video File", v)
+
+    @property
+    def audioFile(self) -> Optional[str]:
+        return self.get("Audio File")
+
+    @audioFile.setter
+    def audioFile(self, v: str) -> None:
+        self.set("Audio File", v)
+
+
+class StylesSection(TrackedList[Style], Section):
+    # Name -> style, built on the first lookup
+    # Later definitions of a name win, the same way libass resolves them
+    # Styles in the index tell the section when they are renamed
+    _styleIndex: Optional[dict[str, Style]] = None
+    _derivedAttributes = ("_styleIndex",)
+
+    def iterLines(self) -> Iterator[str]:
+        yield f"[{StylesSection.header()}]"
+        yield StylesSection.preamble()
+        for style in self:
+            yield str(style)
 
     @staticmethod
     def header() -> str:
@@ -156,22 +393,74 @@ class StylesSection(list[Style], Section):
             return UnknownSection._parse(header, lines)
 
         ret = StylesSection()
-        ret.extend([Style.parse(line) for line in lines[1:]])
+        ret.extend([Style.parse(line) for line in islice(lines, 1, None)])
         return ret
 
+    @staticmethod
+    def iterStyles(lines: Iterable[str]) -> Iterator[Style]:
+        for line in Section._iterItemLines(
+            lines, StylesSection.header(), StylesSection.preamble()
+        ):
+            yield Style.parse(line)
+
+    def getByName(self, name: str, default: Optional[Style] = None) -> Optional[Style]:
+        return self._getStyleIndex().get(name, default)
+
+    def resolveStyles(
+        self, events: Iterable[Event], default: Optional[Style] = None
+    ) -> list[Optional[Style]]:
+        # The style of every event, looked up in one pass
+        index = self._getStyleIndex()
+        return [index.get(event.style, default) for event in events]
+
+    def _getStyleIndex(self) -> dict[str, Style]:
+        if self._styleIndex is None:
+            self._styleIndex = {style.name: style for style in self}
+            for style in self:
+                style._watchName(self)
+
+        return self._styleIndex
+
+    def _onAdd(self, item: Style) -> None:
+        # Appending keeps the index valid, anything else may change which definition wins
+        if self._styleIndex is not None:
+            if self[-1] is item:
+                self._styleIndex[item.name] = item
+                item._watchName(self)
+            else:
+                self._styleIndex = None
 
-class EventsSection(list[Event], Section):
-    def __str__(self) -> str:
-        return (
-            "\n".join(
-                [
-                    f"[{EventsSection.header()}]",
-                    EventsSection.preamble(),
-                    *[str(event) for event in self],
-                ]
-            )
-            + "\n"
-        )
+    def _onRemove(self, item: Style) -> None:
+        # Removed styles may still tell the section about a rename, which only
+        # costs a rebuild
+        if self._styleIndex is not None and self._styleIndex.get(item.name) is item:
+            self._styleIndex = None
+
+    def _onReorder(self) -> None:
+        # Which of several definitions of a name comes last may have changed
+        self._styleIndex = None
+
+    def _onStyleRenamed(self) -> None:
+        self._styleIndex = None
+
+
+class EventsSection(TrackedList[Event], Section, Retimable):
+    # Built on the first time query, then kept up to date as events are added or removed
+    _eventIndex: Optional[IntervalIndex[Event]] = None
+    _derivedAttributes = ("_eventIndex",)
+
+    # Each worker is given a few chunks of at least this many lines,
+    # so that small sections are not slowed down by starting processes
+    _parallelChunkSize = 10000
+
+    def iterLines(self, workers: int = 1) -> Iterator[str]:
+        yield f"[{EventsSection.header()}]"
+        yield EventsSection.preamble()
+        if workers > 1:
+            yield from self._formatInParallel(workers)
+        else:
+            for event in self:
+                yield str(event)
 
     @staticmethod
     def header() -> str:
@@ -182,7 +471,7 @@ class EventsSection(list[Event], Section):
         return "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
 
     @staticmethod
-    def _parse(header: str, lines: Sequence[str]) -> Section:
+    def _parse(header: str, lines: Sequence[str], workers: int = 1) -> Section:
         if header != EventsSection.header():
             return UnknownSection._parse(header, lines)
 
@@ -191,5 +480,169 @@ class EventsSection(list[Event], Section):
             return UnknownSection._parse(header, lines)
 
         ret = EventsSection()
-        ret.extend([Event.parse(line) for line in lines[1:]])
+        if workers > 1:
+            ret.extend(EventsSection._parseInParallel(lines[1:], workers))
+        else:
+            ret.extend([Event.parse(line) for line in islice(lines, 1, None)])
         return ret
+
+    @staticmethod
+    def _parseInParallel(lines: Sequence[str], workers: int) -> list[Event]:
+        chunks = EventsSection._parallelChunks(len(lines), workers)
+        if len(chunks) <= 1:
+            return _parseEvents(lines)
+
+        with EventsSection._executor(workers) as executor:
+            return [
+                event
+                for chunk in executor.map(
+                    _parseEvents, [lines[r.start : r.stop] for r in chunks]
+                )
+                for event in chunk
+            ]
+
+    def _formatInParallel(self, workers: int) -> Iterator[str]:
+        chunks = EventsSection._parallelChunks(len(self), workers)
+        if len(chunks) <= 1:
+            for event in self:
+                yield str(event)
+            return
+
+        # Chunks are printed in any order, but handed back in order
+        if not EventsSection._canShareMemory():
+            with EventsSection._executor(workers) as executor:
+                for lines in executor.map(
+                    _formatEvents, [self[r.start : r.stop] for r in chunks]
+                ):
+                    yield from lines
+            return
+
+        # Pickling events costs more than printing them, so workers that already
+        # have the events in memory are only given their positions
+        token = next(_sectionTokens)
+        _sectionsToFormat[token] = self
+        try:
+            with EventsSection._executor(workers) as executor:
+                for lines in executor.map(
+                    _formatEventRange, itertools.repeat(token), chunks
+                ):
+                    yield from lines
+        finally:
+            del _sectionsToFormat[token]
+
+    @staticmethod
+    def _parallelChunks(n: int, workers: int) -> list[range]:
+        # The positions of n items, split into the chunks handed to workers
+        chunkSize = max(-(-n // (workers * 4)), EventsSection._parallelChunkSize)
+        return [range(i, min(i + chunkSize, n)) for i in range(0, n, chunkSize)]
+
+    @staticmethod
+    def _isFreeThreaded() -> bool:
+        return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    @staticmethod
+    def _canShareMemory() -> bool:
+        # Whether workers can see objects of this process without them being pickled
+        # The start method is the one the application chose, which is never overridden
+        return (
+            EventsSection._isFreeThreaded()
+            or multiprocessing.get_start_method() == "fork"
+        )
+
+    @staticmethod
+    def _executor(workers: int) -> Executor:
+        # Threads only run in parallel on free-threaded builds,
+        # where they spare pickling every event to and from the workers
+        if EventsSection._isFreeThreaded():
+            return ThreadPoolExecutor(workers)
+
+        return ProcessPoolExecutor(workers)
+
+    @staticmethod
+    def iterEvents(lines: Iterable[str]) -> Iterator[Event]:
+        for line in Section._iterItemLines(
+            lines, EventsSection.header(), EventsSection.preamble()
+        ):
+            yield Event.parse(line)
+
+    def activeAt(self, t: timedelta | Timestamp) -> list[Event]:
+        # Events with start <= t < end, in order of their start
+        cs = Timestamp(t).centiseconds
+        return self._getEventIndex().overlapping(cs, cs + 1)
+
+    def activeBetween(
+        self, start: timedelta | Timestamp, end: timedelta | Timestamp
+    ) -> list[Event]:
+        # Events overlapping [start, end), in order of their start
+        return self._getEventIndex().overlapping(
+            Timestamp(start).centiseconds, Timestamp(end).centiseconds
+        )
+
+    def invalidateIndex(self) -> None:
+        # Must be called after changing the times of an event in place
+        self._eventIndex = None
+
+    def _getEventIndex(self) -> IntervalIndex[Event]:
+        if self._eventIndex is None:
+            self._eventIndex = IntervalIndex(
+                [EventsSection._interval(event) for event in self]
+            )
+
+        return self._eventIndex
+
+    def _onAdd(self, item: Event) -> None:
+        if self._eventIndex is not None:
+            self._eventIndex.add(*EventsSection._interval(item))
+
+    def _onRemove(self, item: Event) -> None:
+        if self._eventIndex is not None:
+            self._eventIndex.remove(item)
+
+    @staticmethod
+    def _interval(event: Event) -> tuple[int, int, Event]:
+        return (
+            Timestamp(event.start).centiseconds,
+            Timestamp(event.end).centiseconds,
+            event,
+        )
+
+    def _mapTimes(self, f: Callable[[int], int]) -> None:
+        self.invalidateIndex()
+        for event in self:
+            if event._unknownRawText:
+                continue
+
+            event.start = Timestamp(f(Timestamp(event.start).centiseconds))
+            event.end = Timestamp(f(Timestamp(event.end).centiseconds))
+
+    def _scaleTagTimes(self, factor: float) -> None:
+        for event in self:
+            if event._unknownRawText:
+                continue
+
+            # Text is left unparsed, and untouched if it has no timing tags
+            if isinstance(event._content, str):
+                event.text = Retimable._scaleTextTimes(event._content, factor)
+                continue
+
+            for part in event.parts:
+                part.tags.scaleTimes(factor)
+
+
+def _parseEvents(lines: Sequence[str]) -> list[Event]:
+    # Module level, so that it can be sent to worker processes
+    return [Event.parse(line) for line in lines]
+
+
+# Sections being printed in parallel, which forked workers look up by their token
+_sectionTokens = itertools.count()
+_sectionsToFormat: dict[int, EventsSection] = {}
+
+
+def _formatEvents(events: Sequence[Event]) -> list[str]:
+    # Module level, so that it can be sent to worker processes
+    return [str(event) for event in events]
+
+
+def _formatEventRange(token: int, r: range) -> list[str]:
+    return _formatEvents(_sectionsToFormat[token][r.start : r.stop])
@@ -1,5 +1,6 @@
-from dataclasses import dataclass, field
-from typing import TypeVar
+import weakref
+from dataclasses import dataclass, field, fields
+from typing import Optional, TypeVar
 
 from pyass.color import Color
 from pyass.enum import Alignment, BorderStyle
@@ -8,7 +9,7 @@ from pyass.float import _float
 Style = TypeVar("Style", bound="Style")
 
 
-@dataclass
+@dataclass(slots=True)
 class Style:
     name: str = "Default"
     fontName: str = "Arial"
@@ -43,13 +44,54 @@ class Style:
     encoding: int = 1
     _unknownRawText: str = field(init=False)
 
+    # The line this style was parsed from, along with the fields it was parsed into
+    _source: Optional[tuple[str, tuple]] = field(init=False, repr=False, compare=False)
+
+    # Weak references to the sections whose name index holds this style,
+    # which are told when it is renamed
+    _nameWatchers: Optional[list[weakref.ref]] = field(
+        init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         self._unknownRawText = ""
+        self._source = None
+        self._nameWatchers = None
+
+    def __setattr__(self, name: str, value) -> None:
+        # Styles being constructed or parsed have no watchers yet
+        watchers = getattr(self, "_nameWatchers", None) if name == "name" else None
+        if watchers and self.name != value:
+            object.__setattr__(self, "_nameWatchers", None)
+            for ref in watchers:
+                section = ref()
+                if section is not None:
+                    section._onStyleRenamed()
+
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> dict:
+        # Watchers belong to the sections this style is in, not to its copies
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name != "_nameWatchers"
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
+        object.__setattr__(self, "_nameWatchers", None)
 
     def __str__(self) -> str:
         if self._unknownRawText:
             return self._unknownRawText
 
+        # Styles whose fields are untouched are printed exactly as they were read
+        source = self._source
+        if source is not None and source[1] == self._printedFields():
+            return source[0]
+
         def bool_to_str(v: bool) -> str:
             return "-1" if v else "0"
 
@@ -120,7 +162,48 @@ class Style:
             )
             ret.borderStyle = BorderStyle(int(borderStyle))
             ret.alignment = Alignment(int(alignment))
+
+            # Colors are mutable, so the snapshot holds copies of them
+            fields = ret._printedFields()
+            colors = [Color(c.r, c.g, c.b, c.a) for c in fields[3:7]]
+            ret._source = (s, (*fields[:3], *colors, *fields[7:]))
         except:
             ret._unknownRawText = s
 
         return ret
+
+    def _watchName(self, section: object) -> None:
+        # section._onStyleRenamed is called the next time this style is renamed
+        if self._nameWatchers is None:
+            self._nameWatchers = []
+        elif any(ref() is section for ref in self._nameWatchers):
+            return
+
+        self._nameWatchers.append(weakref.ref(section))
+
+    def _printedFields(self) -> tuple:
+        return (
+            self.name,
+            self.fontName,
+            self.fontSize,
+            self.primaryColor,
+            self.secondaryColor,
+            self.outlineColor,
+            self.backColor,
+            self.isBold,
+            self.isItalic,
+            self.isUnderline,
+            self.isStrikeout,
+            self.scaleX,
+            self.scaleY,
+            self.spacing,
+            self.angle,
+            self.borderStyle,
+            self.outline,
+            self.shadow,
+            self.alignment,
+            self.marginL,
+            self.marginR,
+            self.marginV,
+            self.encoding,
+        )
@@ -1,7 +1,8 @@
 import functools
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from datetime import timedelta
 from typing import Optional, TypeVar, overload
 
@@ -14,6 +15,7 @@ from pyass.timedelta import timedelta as pyasstimedelta
 
 Tag = TypeVar("Tag", bound="Tag")
 Tags = TypeVar("Tags", bound="Tags")
+TagsCache = TypeVar("TagsCache", bound="TagsCache")
 BoolTag = TypeVar("BoolTag", bound="BoolTag")
 StrTag = TypeVar("StrTag", bound="StrTag")
 IntTag = TypeVar("IntTag", bound="IntTag")
@@ -21,6 +23,8 @@ FloatTag = TypeVar("FloatTag", bound="FloatTag")
 
 # Abstract tags
 class Tag(ABC):
+    __slots__ = ()
+
     @staticmethod
     @abstractmethod
     def prefixes() -> list[str]:
@@ -32,14 +36,23 @@ class Tag(ABC):
             return CommentTag(s)
 
         # Some tag prefixes are substrings of other tag prefixes (e.g. \b and \be)
-        # To distinguish between them, first sort the prefixes in descending order by key length
-        # in order to prioritize longer matches first
-        for prefix, TagType in Tag.prefixToTagType():
-            if s.startswith(prefix):
-                try:
-                    return TagType._parse(prefix, s.removeprefix(prefix))
-                except:
-                    continue
+        # To distinguish between them, walk the prefix trie to find every prefix of s,
+        # then try them from the longest to the shortest
+        node = Tag.prefixTrie()
+        matches: list[tuple[int, type[Tag]]] = []
+        for i, c in enumerate(s):
+            node = node.get(c)
+            if node is None:
+                break
+
+            if "" in node:
+                matches.append((i + 1, node[""]))
+
+        for prefixLen, TagType in reversed(matches):
+            try:
+                return TagType._parse(s[:prefixLen], s[prefixLen:])
+            except:
+                continue
 
         return UnknownTag(s)
 
@@ -95,12 +108,66 @@ class Tag(ABC):
         prefixToTagType.sort(key=lambda x: len(x[0]), reverse=True)
         return prefixToTagType
 
+    @staticmethod
+    @functools.cache
+    def prefixTrie() -> dict:
+        # Each node maps the next character of a prefix to its child node
+        # The tag type of a complete prefix is stored under the empty string
+        root = {}
+        for prefix, TagType in Tag.prefixToTagType():
+            node = root
+            for c in prefix:
+                node = node.setdefault(c, {})
+            node[""] = TagType
+
+        return root
+
     @abstractmethod
     def __str__(self) -> str:
         return super().__str__()
 
+    def scaleTimes(self, factor: float) -> None:
+        # Only tags with timing arguments are affected, e.g. \move, \fad, \t and \k
+        pass
+
+    @staticmethod
+    def _scaleMilliseconds(td: timedelta, factor: float) -> timedelta:
+        # Rounded to the resolution the tag is written with, so no drift is introduced
+        return timedelta(
+            milliseconds=round(pyasstimedelta(td).total_milliseconds() * factor)
+        )
+
+    def _copy(self) -> Tag:
+        # Much cheaper than copy.deepcopy, which would cost more than parsing the tag again
+        ret = object.__new__(type(self))
+        for name in self._fieldNames():
+            v = getattr(self, name)
+            if isinstance(v, Position):
+                v = Position(v.x, v.y)
+            elif isinstance(v, Color):
+                v = Color(v.r, v.g, v.b, v.a)
+            elif isinstance(v, DrawingCommand):
+                v = DrawingCommand(v.text)
+            elif isinstance(v, Tags):
+                v = Tags([tag._copy() for tag in v])
+
+            setattr(ret, name, v)
+
+        return ret
+
+    @classmethod
+    @functools.cache
+    def _canonicalPrefix(cls) -> str:
+        # The prefix a tag is written with, computed once per tag type
+        return cls.prefixes()[0]
 
-@dataclass
+    @classmethod
+    @functools.cache
+    def _fieldNames(cls) -> tuple[str, ...]:
+        return tuple(f.name for f in fields(cls))
+
+
+@dataclass(slots=True)
 class BoolTag(Tag):
     isActive: bool = False
 
@@ -117,10 +184,10 @@ class BoolTag(Tag):
             raise ValueError
 
     def __str__(self) -> str:
-        return f"{self.prefixes()[0]}{1 if self.isActive else 0}"
+        return f"{self._canonicalPrefix()}{1 if self.isActive else 0}"
 
 
-@dataclass
+@dataclass(slots=True)
 class StrTag(Tag):
     _s: str = ""
 
@@ -132,10 +199,10 @@ class StrTag(Tag):
         return cls(rest)
 
     def __str__(self) -> str:
-        return f"{self.prefixes()[0]}{self._s}"
+        return f"{self._canonicalPrefix()}{self._s}"
 
 
-@dataclass
+@dataclass(slots=True)
 class IntTag(Tag):
     _v: int = 0
 
@@ -147,10 +214,10 @@ class IntTag(Tag):
         return cls(int(rest))
 
     def __str__(self) -> str:
-        return f"{self.prefixes()[0]}{int(self._v)}"
+        return f"{self._canonicalPrefix()}{int(self._v)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class FloatTag(Tag):
     _v: float = 0.0
 
@@ -162,10 +229,10 @@ class FloatTag(Tag):
         return cls(float(rest))
 
     def __str__(self) -> str:
-        return f"{self.prefixes()[0]}{_float(self._v)}"
+        return f"{self._canonicalPrefix()}{_float(self._v)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ClipTag(Tag):
     isInverted: bool
 
@@ -191,62 +258,140 @@ class ClipTag(Tag):
 
 
 class Tags(list[Tag]):
+    __slots__ = ()
+
+    _cache: Optional[TagsCache] = None
+
     @staticmethod
     def parse(s: str) -> Tags:
-        if "\\" not in s:
-            return Tags([CommentTag(s)])
+        return Tags._parseSlice(s, 0, len(s))
+
+    @staticmethod
+    def _parseSlice(s: str, start: int, end: int) -> Tags:
+        # Parses s[start:end] without having to copy it out of s first
+        if Tags._cache is not None:
+            return Tags._cache.parse(s[start:end])
+
+        return Tags._tokenize(s, start, end)
+
+    @staticmethod
+    def _tokenize(s: str, start: int, end: int) -> Tags:
+        tagStartIdx = s.find("\\", start, end)
+        if tagStartIdx == -1:
+            return Tags([CommentTag(s[start:end])])
 
         ret = Tags()
         currBracketLevel = 0
-        currTag = ""
-        for c in s:
-            if c == "\\" and currBracketLevel == 0:
-                # This is the start of a new tag
-                if currTag != "":
-                    ret.append(Tag.parse(currTag))
-                    currTag = ""
-            elif c == "(":
-                currBracketLevel += 1
-            elif c == ")":
-                currBracketLevel -= 1
-
-            currTag += c
-
-        if currTag != "":
-            ret.append(Tag.parse(currTag))
+        currTagStart = start
+        prevTagStartIdx = start
+        while tagStartIdx != -1:
+            # A \ only starts a new tag if it is not nested inside brackets
+            currBracketLevel += s.count("(", prevTagStartIdx, tagStartIdx) - s.count(
+                ")", prevTagStartIdx, tagStartIdx
+            )
+            if currBracketLevel == 0 and tagStartIdx != currTagStart:
+                ret.append(Tag.parse(s[currTagStart:tagStartIdx]))
+                currTagStart = tagStartIdx
+
+            prevTagStartIdx = tagStartIdx
+            tagStartIdx = s.find("\\", tagStartIdx + 1, end)
+
+        if currTagStart != end:
+            ret.append(Tag.parse(s[currTagStart:end]))
 
         return ret
 
     def __str__(self) -> str:
-        return "".join(str(tag) for tag in self)
+        return "".join([str(tag) for tag in self])
+
+    def scaleTimes(self, factor: float) -> None:
+        for tag in self:
+            tag.scaleTimes(factor)
+
+    @staticmethod
+    def enableCache(maxsize: int = 4096) -> TagsCache:
+        # Replaces any previously enabled cache
+        Tags._cache = TagsCache(maxsize)
+        return Tags._cache
+
+    @staticmethod
+    def disableCache() -> None:
+        Tags._cache = None
+
+
+class TagsCache:
+    # A bounded LRU cache of parsed override blocks, keyed on the raw block
+    # Every lookup returns a fresh copy, so callers are free to mutate the result
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Tags] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, s: str) -> Tags:
+        tags = self._entries.get(s)
+        if tags is not None:
+            self.hits += 1
+            self._entries.move_to_end(s)
+        else:
+            self.misses += 1
+            tags = Tags._tokenize(s, 0, len(s))
+            self._entries[s] = tags
+
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return Tags([tag._copy() for tag in tags])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
 
 # Concrete tags
 class BoldTag(BoolTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\b"]
 
 
 class ItalicTag(BoolTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\i"]
 
 
 class UnderlineTag(BoolTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\u"]
 
 
 class StrikeoutTag(BoolTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\s"]
 
 
-@dataclass
+@dataclass(slots=True)
 class BorderSizeTag(Tag):
     size: float
     dimension: Dimension2D = Dimension2D.BOTH
@@ -270,7 +415,7 @@ class BorderSizeTag(Tag):
         return f"\\{self.dimension.value}bord{_float(self.size)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ShadowDepthTag(Tag):
     depth: float
     dimension: Dimension2D = Dimension2D.BOTH
@@ -294,7 +439,7 @@ class ShadowDepthTag(Tag):
         return f"\\{self.dimension.value}shad{_float(self.depth)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class BlurEdgesTag(Tag):
     strength: float = 0.0
     useGaussianBlur: bool = False
@@ -320,6 +465,8 @@ class BlurEdgesTag(Tag):
 
 
 class FontNameTag(StrTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\fn"]
@@ -334,6 +481,8 @@ class FontNameTag(StrTag):
 
 
 class FontSizeTag(IntTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\fs"]
@@ -348,6 +497,8 @@ class FontSizeTag(IntTag):
 
 
 class FontEncodingTag(IntTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\fe"]
@@ -361,7 +512,7 @@ class FontEncodingTag(IntTag):
         self._v = i
 
 
-@dataclass
+@dataclass(slots=True)
 class TextScaleTag(Tag):
     scale: float
     dimension: Dimension2D
@@ -390,6 +541,8 @@ class TextScaleTag(Tag):
 
 
 class TextSpacingTag(FloatTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\fsp"]
@@ -403,7 +556,7 @@ class TextSpacingTag(FloatTag):
         self._v = f
 
 
-@dataclass
+@dataclass(slots=True)
 class TextRotationTag(Tag):
     degrees: float
     dimension: Dimension3D = Dimension3D.Z
@@ -434,7 +587,7 @@ class TextRotationTag(Tag):
         return f"\\fr{self.dimension.value}{_float(self.degrees)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TextShearTag(Tag):
     factor: float
     dimension: Dimension2D
@@ -462,7 +615,7 @@ class TextShearTag(Tag):
         return f"\\fa{self.dimension.value}{_float(self.factor)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ColorTag(Tag):
     color: Color
     channel: Channel = Channel.PRIMARY
@@ -486,6 +639,8 @@ class ColorTag(Tag):
         arg4: Optional[Channel] = Channel.PRIMARY,
         /,
     ) -> None:
+        self._useAlternatePrefix = False
+
         if isinstance(arg1, Color) and isinstance(arg2, Channel):
             self.color = arg1
             self.channel = arg2
@@ -537,7 +692,7 @@ class ColorTag(Tag):
         return f"\\{self.channel.value}c&H{self.color.b:02X}{self.color.g:02X}{self.color.r:02X}&"
 
 
-@dataclass
+@dataclass(slots=True)
 class AlphaTag(Tag):
     alpha: int
     channel: Channel = Channel.ALL
@@ -570,7 +725,7 @@ class AlphaTag(Tag):
         return f"\\{self.channel.value}a&H{self.alpha:02X}&"
 
 
-@dataclass
+@dataclass(slots=True)
 class AlignmentTag(Tag):
     alignment: Alignment = Alignment.BOTTOM
     _useAlternatePrefix: bool = field(init=False, default=False)
@@ -622,7 +777,7 @@ class AlignmentTag(Tag):
         return f"\\an{self.alignment.value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class KaraokeTag(Tag):
     duration: timedelta = timedelta()
     isSlide: bool = True
@@ -637,6 +792,7 @@ class KaraokeTag(Tag):
             self.duration = timedelta(milliseconds=duration * 10)
 
         self.isSlide = isSlide
+        self._useAlternatePerefix = False
 
     @staticmethod
     def prefixes() -> list[str]:
@@ -665,8 +821,12 @@ class KaraokeTag(Tag):
             r"\kf" if self.isSlide else r"\k"
         ) + f"{pyasstimedelta(self.duration).total_centiseconds()}"
 
+    def scaleTimes(self, factor: float) -> None:
+        cs = round(pyasstimedelta(self.duration).total_centiseconds() * factor)
+        self.duration = timedelta(milliseconds=cs * 10)
 
-@dataclass
+
+@dataclass(slots=True)
 class IFXTag(StrTag):
     @staticmethod
     def prefixes() -> list[str]:
@@ -681,7 +841,7 @@ class IFXTag(StrTag):
         self._s = s
 
 
-@dataclass
+@dataclass(slots=True)
 class WrappingStyleTag(Tag):
     style: Wrapping
 
@@ -697,7 +857,7 @@ class WrappingStyleTag(Tag):
         return f"\\q{self.style.value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ResetTag(StrTag):
     @staticmethod
     def prefixes() -> list[str]:
@@ -712,7 +872,7 @@ class ResetTag(StrTag):
         self._s = s
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionTag(Tag):
     position: Position
 
@@ -744,7 +904,7 @@ class PositionTag(Tag):
         return f"\\pos({self.position})"
 
 
-@dataclass
+@dataclass(slots=True)
 class MoveTag(Tag):
     startPos: Position
     endPos: Position
@@ -778,8 +938,12 @@ class MoveTag(Tag):
 
         return f"\\move({self.startPos},{self.endPos})"
 
+    def scaleTimes(self, factor: float) -> None:
+        self.startTime = Tag._scaleMilliseconds(self.startTime, factor)
+        self.endTime = Tag._scaleMilliseconds(self.endTime, factor)
+
 
-@dataclass
+@dataclass(slots=True)
 class RotationTag(Tag):
     origin: Position
 
@@ -811,7 +975,7 @@ class RotationTag(Tag):
         return f"\\org({self.origin})"
 
 
-@dataclass
+@dataclass(slots=True)
 class FadeTag(Tag):
     inDuration: timedelta = timedelta()
     outDuration: timedelta = timedelta()
@@ -856,8 +1020,12 @@ class FadeTag(Tag):
     def __str__(self) -> str:
         return f"\\fad({pyasstimedelta(self.inDuration).total_milliseconds()},{pyasstimedelta(self.outDuration).total_milliseconds()})"
 
+    def scaleTimes(self, factor: float) -> None:
+        self.inDuration = Tag._scaleMilliseconds(self.inDuration, factor)
+        self.outDuration = Tag._scaleMilliseconds(self.outDuration, factor)
 
-@dataclass
+
+@dataclass(slots=True)
 class ComplexFadeTag(Tag):
     a1: int
     a2: int
@@ -891,8 +1059,14 @@ class ComplexFadeTag(Tag):
     def __str__(self) -> str:
         return f"\\fade({self.a1},{self.a2},{self.a3},{pyasstimedelta(self.t1).total_milliseconds()},{pyasstimedelta(self.t2).total_milliseconds()},{pyasstimedelta(self.t3).total_milliseconds()},{pyasstimedelta(self.t4).total_milliseconds()})"
 
+    def scaleTimes(self, factor: float) -> None:
+        self.t1 = Tag._scaleMilliseconds(self.t1, factor)
+        self.t2 = Tag._scaleMilliseconds(self.t2, factor)
+        self.t3 = Tag._scaleMilliseconds(self.t3, factor)
+        self.t4 = Tag._scaleMilliseconds(self.t4, factor)
+
 
-@dataclass
+@dataclass(slots=True)
 class TransformTag(Tag):
     start: timedelta = timedelta()
     end: Optional[timedelta] = None
@@ -954,8 +1128,13 @@ class TransformTag(Tag):
         else:
             return f"\\t({pyasstimedelta(self.start).total_milliseconds()},{pyasstimedelta(self.end).total_milliseconds()},{self.accel},{self.to})"
 
+    def scaleTimes(self, factor: float) -> None:
+        self.start = Tag._scaleMilliseconds(self.start, factor)
+        if self.end is not None:
+            self.end = Tag._scaleMilliseconds(self.end, factor)
 
-@dataclass
+
+@dataclass(slots=True)
 class RectangularClipTag(ClipTag):
     topLeftPos: Position
     bottomRightPos: Position
@@ -964,7 +1143,7 @@ class RectangularClipTag(ClipTag):
         return f'\\{"i" if self.isInverted else ""}clip({self.topLeftPos},{self.bottomRightPos})'
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawingClipTag(ClipTag):
     scale: int
     drawingCommand: DrawingCommand
@@ -974,6 +1153,8 @@ class DrawingClipTag(ClipTag):
 
 
 class DrawingTag(IntTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\p"]
@@ -988,6 +1169,8 @@ class DrawingTag(IntTag):
 
 
 class DrawingYOffsetTag(IntTag):
+    __slots__ = ()
+
     @staticmethod
     def prefixes() -> list[str]:
         return [r"\pbo"]
@@ -1001,7 +1184,7 @@ class DrawingYOffsetTag(IntTag):
         self._v = i
 
 
-@dataclass
+@dataclass(slots=True)
 class UnknownTag(Tag):
     text: str
 
@@ -1021,4 +1204,4 @@ class CommentTag(UnknownTag):
     # Strictly speaking, this is not a tag
     # But since curly braces are also often used for comments, a distinction is made here
     # A tag will only be parsed as a comment if it does not contain the \ character
-    pass
+    __slots__ = ()
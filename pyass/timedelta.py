@@ -1,11 +1,13 @@
 import datetime
-from typing import Optional
+from typing import Iterable, Optional
+
+from pyass.timestamp import Timestamp
 
 
 class timedelta(datetime.timedelta):
     def __new__(
         cls,
-        other: Optional[datetime.timedelta] = None,
+        other: Optional[datetime.timedelta | Timestamp] = None,
         /,
         days=0,
         seconds=0,
@@ -32,39 +34,52 @@ class timedelta(datetime.timedelta):
             weeks,
         )
 
+    def __reduce__(self):
+        # The inherited one passes days first, where __new__ expects another timedelta
+        return (timedelta, (None, self.days, self.seconds, self.microseconds))
+
     @staticmethod
     def parse(s: str):
-        is_neg = s.startswith("-")
-        s = s.removeprefix("-")
+        return timedelta._fromCentiseconds(Timestamp._parseCentiseconds(s))
 
-        s_str, _, cs_str = s.partition(".")
-        hrs, mins, secs = map(int, s_str.split(":"))
-        cs = int(cs_str)
+    @staticmethod
+    def parseMany(strs: Iterable[str]) -> list["timedelta"]:
+        # timedelta is immutable, so each distinct string is only parsed once and then shared
+        memo: dict[str, timedelta] = {}
+        ret = []
+        for s in strs:
+            td = memo.get(s)
+            if td is None:
+                td = memo[s] = timedelta.parse(s)
+            ret.append(td)
+
+        return ret
 
-        td = timedelta(hours=hrs, minutes=mins, seconds=secs, centiseconds=cs)
-        return -td if is_neg else td
+    @staticmethod
+    def formatMany(tds: Iterable[datetime.timedelta]) -> list[str]:
+        return Timestamp.formatMany(tds)
 
     def __str__(self) -> str:
-        is_neg = self.total_seconds() < 0
-        td = -self if is_neg else self
-
-        hours, remainder = td.total_seconds() // 3600, td.total_seconds() % 3600
-        minutes, seconds = remainder // 60, remainder % 60
-
-        s = "{:01}:{:02}:{:02}.{:02}".format(
-            int(hours), int(minutes), int(seconds), int(td.microseconds // 10000)
-        )
+        return Timestamp._formatCentiseconds(Timestamp._centisecondsOf(self))
 
-        return "-" + s if is_neg else s
+    @staticmethod
+    def _fromCentiseconds(cs: int):
+        return datetime.timedelta.__new__(timedelta, 0, 0, cs * 10000)
 
     def __add__(self, other):
         result = super(timedelta, self).__add__(other)
+        if result is NotImplemented:
+            return NotImplemented
+
         return timedelta(
             days=result.days, seconds=result.seconds, microseconds=result.microseconds
         )
 
     def __sub__(self, other):
         result = super(timedelta, self).__sub__(other)
+        if result is NotImplemented:
+            return NotImplemented
+
         return timedelta(
             days=result.days, seconds=result.seconds, microseconds=result.microseconds
         )
@@ -77,6 +92,9 @@ class timedelta(datetime.timedelta):
 
     def __mul__(self, other):
         result = super(timedelta, self).__mul__(other)
+        if result is NotImplemented:
+            return NotImplemented
+
         return timedelta(
             days=result.days, seconds=result.seconds, microseconds=result.microseconds
         )
@@ -105,6 +123,9 @@ class timedelta(datetime.timedelta):
 
     def __mod__(self, other):
         result = super(timedelta, self).__mod__(other)
+        if result is NotImplemented:
+            return NotImplemented
+
         return timedelta(
             days=result.days, seconds=result.seconds, microseconds=result.microseconds
         )
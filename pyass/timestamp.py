@@ -0,0 +1,277 @@
+import datetime
+import operator
+from typing import Iterable, Optional, TypeVar, overload
+
+Timestamp = TypeVar("Timestamp", bound="Timestamp")
+DateT = TypeVar("DateT", bound=datetime.date)
+
+
+class Timestamp:
+    # An ASS time, stored as an integer number of centiseconds
+    # Arithmetic between timestamps is exact, and they interoperate with datetime.timedelta
+    __slots__ = ("_cs",)
+
+    def __init__(self, value: int | datetime.timedelta | Timestamp = 0, /) -> None:
+        if isinstance(value, Timestamp):
+            self._cs = value._cs
+        elif isinstance(value, datetime.timedelta):
+            self._cs = Timestamp._centisecondsOf(value)
+        else:
+            self._cs = operator.index(value)
+
+    @property
+    def centiseconds(self) -> int:
+        return self._cs
+
+    @staticmethod
+    def parse(s: str) -> Timestamp:
+        return Timestamp(Timestamp._parseCentiseconds(s))
+
+    @staticmethod
+    def parseMany(strs: Iterable[str]) -> list[Timestamp]:
+        # Times repeat a lot within a script (e.g. an event ending where the next one starts)
+        # Timestamps are immutable, so each distinct string is only parsed once and then shared
+        memo: dict[str, Timestamp] = {}
+        ret = []
+        for s in strs:
+            ts = memo.get(s)
+            if ts is None:
+                ts = memo[s] = Timestamp.parse(s)
+            ret.append(ts)
+
+        return ret
+
+    @staticmethod
+    def formatMany(values: Iterable[Timestamp | datetime.timedelta]) -> list[str]:
+        memo: dict[int, str] = {}
+        ret = []
+        for value in values:
+            cs = Timestamp._centisecondsOf(value)
+            s = memo.get(cs)
+            if s is None:
+                s = memo[cs] = Timestamp._formatCentiseconds(cs)
+            ret.append(s)
+
+        return ret
+
+    def __str__(self) -> str:
+        return Timestamp._formatCentiseconds(self._cs)
+
+    def __repr__(self) -> str:
+        return f"Timestamp({self._cs})"
+
+    def __reduce__(self):
+        return (Timestamp, (self._cs,))
+
+    def __hash__(self) -> int:
+        # Equal timestamps and timedeltas must hash equally
+        return hash(datetime.timedelta(microseconds=self._cs * 10000))
+
+    def __bool__(self) -> bool:
+        return self._cs != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Timestamp):
+            return self._cs == other._cs
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 == us
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, Timestamp):
+            return self._cs < other._cs
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 < us
+
+    def __le__(self, other) -> bool:
+        if isinstance(other, Timestamp):
+            return self._cs <= other._cs
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 <= us
+
+    def __gt__(self, other) -> bool:
+        if isinstance(other, Timestamp):
+            return self._cs > other._cs
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 > us
+
+    def __ge__(self, other) -> bool:
+        if isinstance(other, Timestamp):
+            return self._cs >= other._cs
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 >= us
+
+    @overload
+    def __add__(self, other: Timestamp | datetime.timedelta) -> Timestamp:
+        ...
+
+    @overload
+    def __add__(self, other: DateT) -> DateT:
+        ...
+
+    def __add__(self, other):
+        if isinstance(other, Timestamp):
+            return Timestamp(self._cs + other._cs)
+        elif isinstance(other, datetime.date):
+            # Dates and datetimes are moved the same way a timedelta moves them
+            return other + self.toTimedelta()
+
+        us = Timestamp._microsecondsOf(other)
+        if us is None:
+            return NotImplemented
+
+        return Timestamp(Timestamp._truncate(self._cs * 10000 + us))
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> Timestamp:
+        if isinstance(other, Timestamp):
+            return Timestamp(self._cs - other._cs)
+
+        us = Timestamp._microsecondsOf(other)
+        if us is None:
+            return NotImplemented
+
+        return Timestamp(Timestamp._truncate(self._cs * 10000 - us))
+
+    @overload
+    def __rsub__(self, other: datetime.timedelta) -> Timestamp:
+        ...
+
+    @overload
+    def __rsub__(self, other: DateT) -> DateT:
+        ...
+
+    def __rsub__(self, other):
+        if isinstance(other, datetime.date):
+            return other - self.toTimedelta()
+
+        us = Timestamp._microsecondsOf(other)
+        if us is None:
+            return NotImplemented
+
+        return Timestamp(Timestamp._truncate(us - self._cs * 10000))
+
+    def __neg__(self) -> Timestamp:
+        return Timestamp(-self._cs)
+
+    def __pos__(self) -> Timestamp:
+        return self
+
+    def __abs__(self) -> Timestamp:
+        return Timestamp(abs(self._cs))
+
+    def __mul__(self, other) -> Timestamp:
+        if isinstance(other, int):
+            return Timestamp(self._cs * other)
+        elif isinstance(other, float):
+            return Timestamp(round(self._cs * other))
+
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (int, float)):
+            return Timestamp(round(self._cs / other))
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 / us
+
+    def __floordiv__(self, other):
+        if isinstance(other, int):
+            return Timestamp(self._cs // other)
+
+        us = Timestamp._microsecondsOf(other)
+        return NotImplemented if us is None else self._cs * 10000 // us
+
+    def __mod__(self, other) -> Timestamp:
+        us = Timestamp._microsecondsOf(other)
+        if us is None:
+            return NotImplemented
+
+        return Timestamp(Timestamp._truncate(self._cs * 10000 % us))
+
+    @property
+    def days(self) -> int:
+        return self._cs // 8640000
+
+    @property
+    def seconds(self) -> int:
+        return self._cs % 8640000 // 100
+
+    @property
+    def microseconds(self) -> int:
+        return self._cs % 100 * 10000
+
+    def total_seconds(self) -> float:
+        return self._cs / 100
+
+    def total_centiseconds(self) -> int:
+        return self._cs
+
+    def total_milliseconds(self) -> int:
+        return self._cs * 10
+
+    def toTimedelta(self) -> datetime.timedelta:
+        return datetime.timedelta(milliseconds=self._cs * 10)
+
+    @staticmethod
+    def _parseCentiseconds(s: str) -> int:
+        # Fast path for the canonical H:MM:SS.CC form
+        if len(s) == 10 and s[1] == ":" and s[4] == ":" and s[7] == ".":
+            return (
+                int(s[0]) * 360000
+                + int(s[2:4]) * 6000
+                + int(s[5:7]) * 100
+                + int(s[8:10])
+            )
+
+        # Fall back to the general form, e.g. negative times or multi-digit hours
+        is_neg = s.startswith("-")
+        s = s.removeprefix("-")
+
+        s_str, _, cs_str = s.partition(".")
+        hrs, mins, secs = map(int, s_str.split(":"))
+        cs = hrs * 360000 + mins * 6000 + secs * 100 + int(cs_str)
+
+        return -cs if is_neg else cs
+
+    @staticmethod
+    def _formatCentiseconds(cs: int) -> str:
+        sign = "-" if cs < 0 else ""
+
+        secs, cs = divmod(abs(cs), 100)
+        mins, secs = divmod(secs, 60)
+        hrs, mins = divmod(mins, 60)
+
+        return f"{sign}{hrs}:{mins:02}:{secs:02}.{cs:02}"
+
+    @staticmethod
+    def _centisecondsOf(value: Timestamp | datetime.timedelta) -> int:
+        if isinstance(value, Timestamp):
+            return value._cs
+
+        return Timestamp._truncate(Timestamp._microseconds(value))
+
+    @staticmethod
+    def _microseconds(td: datetime.timedelta) -> int:
+        return (td.days * 86400 + td.seconds) * 1000000 + td.microseconds
+
+    @staticmethod
+    def _microsecondsOf(other) -> Optional[int]:
+        if isinstance(other, Timestamp):
+            return other._cs * 10000
+        elif isinstance(other, datetime.timedelta):
+            return Timestamp._microseconds(other)
+
+        return None
+
+    @staticmethod
+    def _truncate(us: int) -> int:
+        # Round towards zero, the same way timedelta.__str__ drops sub-centisecond digits
+        return us // 10000 if us >= 0 else -(-us // 10000)
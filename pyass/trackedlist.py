@@ -0,0 +1,114 @@
+from typing import Iterable, SupportsIndex, TypeVar
+
+T = TypeVar("T")
+
+
+class TrackedList(list[T]):
+    # A list that is told about every item added to or removed from it,
+    # so that subclasses can keep derived state such as indices up to date
+    # Hooks run after the list itself has been updated
+
+    # Derived state is rebuilt on demand instead of being copied or pickled
+    _derivedAttributes: tuple[str, ...] = ()
+
+    def __init__(self, iterable: Iterable[T] = ()) -> None:
+        removed = list(self)
+        super().__init__(iterable)
+        self._onRemoveMany(removed)
+        self._onAddMany(self)
+
+    def __getstate__(self) -> dict:
+        return {
+            k: v for k, v in self.__dict__.items() if k not in self._derivedAttributes
+        }
+
+    def _onAdd(self, item: T) -> None:
+        pass
+
+    def _onRemove(self, item: T) -> None:
+        pass
+
+    def _onReorder(self) -> None:
+        # Called after items have moved without being added or removed
+        pass
+
+    def _onAddMany(self, items: Iterable[T]) -> None:
+        for item in items:
+            self._onAdd(item)
+
+    def _onRemoveMany(self, items: Iterable[T]) -> None:
+        for item in items:
+            self._onRemove(item)
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, slice):
+            value = list(value)
+            removed = self[key]
+            super().__setitem__(key, value)
+            self._onRemoveMany(removed)
+            self._onAddMany(value)
+        else:
+            removed = self[key]
+            super().__setitem__(key, value)
+            self._onRemove(removed)
+            self._onAdd(value)
+
+    def __delitem__(self, key) -> None:
+        removed = self[key] if isinstance(key, slice) else [self[key]]
+        super().__delitem__(key)
+        self._onRemoveMany(removed)
+
+    def __iadd__(self, other: Iterable[T]):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n: SupportsIndex):
+        items = list(self)
+        super().__imul__(n)
+        if not items:
+            pass
+        elif not self:
+            self._onRemoveMany(items)
+        else:
+            for _ in range(len(self) // len(items) - 1):
+                self._onAddMany(items)
+
+        return self
+
+    def append(self, item: T) -> None:
+        super().append(item)
+        self._onAdd(item)
+
+    def extend(self, iterable: Iterable[T]) -> None:
+        items = list(iterable)
+        super().extend(items)
+        self._onAddMany(items)
+
+    def insert(self, i: SupportsIndex, item: T) -> None:
+        super().insert(i, item)
+        self._onAdd(item)
+
+    def pop(self, i: SupportsIndex = -1) -> T:
+        item = super().pop(i)
+        self._onRemove(item)
+        return item
+
+    def remove(self, item: T) -> None:
+        # The removed item is only equal to the given one, and may not be the same object
+        i = self.index(item)
+        removed = self[i]
+        super().__delitem__(i)
+        self._onRemove(removed)
+
+    def clear(self) -> None:
+        removed = list(self)
+        super().clear()
+        self._onRemoveMany(removed)
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._onReorder()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._onReorder()
@@ -1,4 +1,5 @@
 from pyass import *
+from pyass.tag import CommentTag, UnknownTag
 
 
 class TestEvent:
@@ -119,3 +120,91 @@ class TestEvent:
             assert str(o) == s
             assert Event.parse(s) == o
             assert Event.parse(s).text == s.split(",", 9)[9]
+
+    def test_parts(self):
+        for s, parts in [
+            ("", []),
+            ("text", [EventPart(text="text")]),
+            ("{text", [EventPart(text="{text")]),
+            ("text}", [EventPart(text="text}")]),
+            (
+                r"lead{\be1}text",
+                [
+                    EventPart(text="lead"),
+                    EventPart(tags=[BlurEdgesTag(1)], text="text"),
+                ],
+            ),
+            (
+                r"{comment}text{\be1}",
+                [
+                    EventPart(tags=[CommentTag("comment")], text="text"),
+                    EventPart(tags=[BlurEdgesTag(1)]),
+                ],
+            ),
+            (
+                r"{\be1{\be2}text",
+                [EventPart(tags=[UnknownTag(r"\be1{"), BlurEdgesTag(2)], text="text")],
+            ),
+            # Unterminated blocks are dropped
+            (r"{\be1}text{\be2", [EventPart(tags=[BlurEdgesTag(1)], text="text")]),
+            (
+                r"}{\be1}text",
+                [EventPart(text="}"), EventPart(tags=[BlurEdgesTag(1)], text="text")],
+            ),
+        ]:
+            assert Event(text=s).parts == parts, f"Parse {s}"
+
+    def test_text_and_parts(self):
+        event = Event(text=r"{\be1}text")
+        assert event.text == r"{\be1}text"
+        assert event.parts == [EventPart(tags=[BlurEdgesTag(1)], text="text")]
+        assert event.text == r"{\be1}text"
+
+        event.parts[0].text = "more text"
+        assert event.text == r"{\be1}more text"
+
+        event.text = ""
+        assert event.parts == []
+        assert event.text == ""
+
+        event.parts = [EventPart(text="text")]
+        assert event.text == "text"
+
+        assert Event().parts is not Event().parts
+
+    def test_source_line(self):
+        # Untouched events are printed exactly as they were read
+        s = r"Dialogue: 00,0:00:00.50,0:00:05.00,Default,,0,0,0,,{\be1}text"
+        event = Event.parse(s)
+        assert str(event) == s
+        assert str(event) == str(Event.parse(s))
+
+        event.layer = 1
+        assert (
+            str(event)
+            == r"Dialogue: 1,0:00:00.50,0:00:05.00,Default,,0,0,0,,{\be1}text"
+        )
+
+        event = Event.parse(s)
+        event.text = "text"
+        assert str(event).endswith(",,text")
+
+        event = Event.parse(s)
+        event.parts[0].text = "more text"
+        assert str(event).endswith(r",,{\be1}more text")
+
+    def test_cached_str(self):
+        event = Event(text="text")
+        s = str(event)
+        assert str(event) is s
+
+        event.start = Timestamp(100)
+        assert str(event) == "Dialogue: 0,0:00:01.00,0:00:00.00,Default,,0,0,0,,text"
+
+        event.parts[0].tags.append(BoldTag(True))
+        assert str(event).endswith(r",,{\b1}text")
+
+        tag = event.parts[0].tags[0]
+        assert isinstance(tag, BoldTag)
+        tag.isActive = False
+        assert str(event).endswith(r",,{\b0}text")
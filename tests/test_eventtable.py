@@ -0,0 +1,160 @@
+import textwrap
+
+from pyass import *
+
+
+class TestEventTable:
+    def test_event_table(self):
+        for s in [
+            textwrap.dedent(
+                """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            """
+            ),
+            textwrap.dedent(
+                """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,Hello
+            Comment: 1,0:00:05.00,0:00:10.50,Title,abc,10,20,30,Scroll up;1;2;3,{\\b1}World
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,a,b,c
+            Invalid
+            Dialogue: 0,-0:00:01.00,100:00:00.00,Default,,0,0,0,,
+            """
+            ),
+        ]:
+            section = Section.parse(s)
+            assert isinstance(section, EventsSection)
+            table = EventTable.parse(s)
+
+            assert str(table) == s
+            assert len(table) == len(section)
+            assert [str(event) for event in table] == [str(event) for event in section]
+            assert str(table.toEventsSection()) == s
+            assert str(EventTable.fromEventsSection(section)) == s
+            assert EventTable.fromEventsSection(section) == table
+
+    def test_source_lines(self):
+        s = textwrap.dedent(
+            """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.5,0:00:05.00,Default,,0,0,0,,a
+            Dialogue:  00,0:00:01.00,0:00:05.00,Default,,010,0,0,,b\t
+            Dialogue: 0,10:00:00.00,-0:00:01.00,Default,,0,0,0,,c
+            """
+        )
+        section = Section.parse(s)
+        assert isinstance(section, EventsSection)
+
+        # Rows are printed as they were read, like events are
+        for table in [EventTable.parse(s), EventTable.fromEventsSection(section)]:
+            assert str(table) == str(section) == s
+            assert [str(event) for event in table] == s.splitlines()[2:]
+
+            # Changed rows are printed from their fields
+            table.start[0] += 1
+            event = table[1]
+            event.marginL = 20
+            table[1] = event
+            assert table._formatRow(0).startswith("Dialogue: 0,0:00:00.06,")
+            assert str(table).splitlines()[3:] == [
+                "Dialogue: 0,0:00:01.00,0:00:05.00,Default,,20,0,0,,b",
+                "Dialogue: 0,10:00:00.00,-0:00:01.00,Default,,0,0,0,,c",
+            ]
+
+    def test_columns(self):
+        table = EventTable(
+            [
+                Event(start=timedelta(seconds=1), end=timedelta(seconds=2)),
+                Event(start=timedelta(seconds=3), end=timedelta(seconds=4), layer=1),
+            ]
+        )
+        assert list(table.start) == [100, 300]
+        assert list(table.end) == [200, 400]
+        assert list(table.layer) == [0, 1]
+        assert table.style[0] is table.style[1]
+
+        table[-1] = Event(style="Title", text="abc")
+        assert table[1].style == "Title"
+        assert table[1].text == "abc"
+        assert table[1].start == timedelta()
+
+        table.clear()
+        assert len(table) == 0
+
+    def test_retime(self):
+        s = textwrap.dedent(
+            """\
+        [Events]
+        Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+        Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,{\\move(0,0,1,1,100,200)\\fad(100,300)}a{\\k100}b
+        Dialogue: 0,0:00:03.05,0:00:04.10,Default,,0,0,0,,{\\pos(1,2)}Plain
+        Invalid
+        """
+        )
+
+        for o in [EventTable.parse(s), Section.parse(s)]:
+            o.shift(timedelta(seconds=1))
+            o.scale(2, origin=timedelta(seconds=2), scaleTags=True)
+            assert str(o) == textwrap.dedent(
+                """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:02.00,0:00:04.00,Default,,0,0,0,,{\\move(0,0,1,1,200,400)\\fad(200,600)}a{\\k200}b
+            Dialogue: 0,0:00:06.10,0:00:08.20,Default,,0,0,0,,{\\pos(1,2)}Plain
+            Invalid
+            """
+            )
+
+            o.round(timedelta(seconds=1))
+            o.clamp(timedelta(seconds=3), timedelta(seconds=7))
+            assert [(event.start, event.end) for event in o][:2] == [
+                (timedelta(seconds=3), timedelta(seconds=4)),
+                (timedelta(seconds=6), timedelta(seconds=7)),
+            ]
+
+    def test_scale_tags_keeps_text(self):
+        section = Section.parse(
+            textwrap.dedent(
+                """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,{\\an8}plain text
+            Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,{\\k10}a
+            """
+            )
+        )
+        assert isinstance(section, EventsSection)
+        section.append(Event(text=r"{\fad(100,100)}b"))
+        section[-1].parts
+
+        section.scale(2, scaleTags=True)
+
+        # Events without timing tags are neither parsed nor re-serialized
+        assert isinstance(section[0]._content, str)
+        assert section[0].text == r"{\an8}plain text"
+        assert section[1].text == r"{\k20}a"
+        assert section[2].text == r"{\fad(200,200)}b"
+
+    def test_convert_framerate(self):
+        from fractions import Fraction
+
+        for o in [
+            EventTable([Event(start=timedelta(seconds=25), end=timedelta(seconds=50))]),
+            EventsSection(
+                [Event(start=timedelta(seconds=25), end=timedelta(seconds=50))]
+            ),
+        ]:
+            o.convertFramerate(25, 24)
+            assert (o[0].start, o[0].end) == (
+                timedelta(seconds=26, milliseconds=40),
+                timedelta(seconds=52, milliseconds=80),
+            )
+
+            o.convertFramerate(24, Fraction(24000, 1001))
+            assert (o[0].start, o[0].end) == (
+                timedelta(seconds=26, milliseconds=70),
+                timedelta(seconds=52, milliseconds=130),
+            )
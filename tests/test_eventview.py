@@ -0,0 +1,123 @@
+import mmap
+import tempfile
+import textwrap
+
+from pyass import *
+
+
+class TestEventView:
+    def test_event_view(self):
+        s = textwrap.dedent(
+            """\
+            [Script Info]
+            Title: Default Aegisub file
+
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,Hello
+
+            Comment: 1,0:00:05.00,0:00:10.50,Title,abc,10,20,30,Scroll up;1;2;3,{\\b1}World,again
+            Dialogue: x,0:00:00.00,0:00:05.00,Default,,0,0,0,,Bad layer
+            Invalid
+
+            [Unknown Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:07.00,0:00:09.00,Default,,0,0,0,,not an event
+            """
+        )
+        events = list(EventsSection.iterEvents(s.splitlines()))
+
+        for views in [
+            view_events(s),
+            view_events(s.encode()),
+            view_events(s.replace("\n", "\r\n").encode()),
+        ]:
+            assert len(views) == len(events) == 5
+            assert [str(view) for view in views] == [str(event) for event in events]
+            for view, event in zip(views, events):
+                # Unlike Event.parse, a bad field does not hide the others
+                if view.text == "Bad layer":
+                    assert view.layer == event.layer == 0
+                    assert view.end == timedelta(seconds=5)
+                    continue
+
+                for name in [
+                    "format",
+                    "layer",
+                    "start",
+                    "end",
+                    "style",
+                    "name",
+                    "marginL",
+                    "marginR",
+                    "marginV",
+                    "effect",
+                    "text",
+                ]:
+                    assert getattr(view, name) == getattr(event, name), name
+
+            assert str(views.toEventsSection()) == str(EventsSection(events))
+
+    def test_promote(self):
+        s = textwrap.dedent(
+            """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,Hello
+            Dialogue: 0,0:00:05.00,0:00:07.00,Default,,0,0,0,,World
+            """
+        )
+        views = view_events(s)
+        assert str(views) == s
+        assert isinstance(views[0], EventView)
+
+        event = views.promote(-1)
+        assert views.promote(1) is event
+        event.text = "Everyone"
+        views[0] = Event(text="Hi")
+        assert str(views) == textwrap.dedent(
+            """\
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:00.00,Default,,0,0,0,,Hi
+            Dialogue: 0,0:00:05.00,0:00:07.00,Default,,0,0,0,,Everyone
+            """
+        )
+
+        try:
+            views[2]
+            assert False
+        except IndexError:
+            pass
+
+        # Setting a field of a view promotes it, and its list sees the change
+        views = view_events(s)
+        view, other = views[0], views[0]
+        assert isinstance(view, EventView)
+        view.text = "Hi"
+        view.layer = 1
+        assert isinstance(views[0], Event)
+        assert views[0].text == other.text == "Hi"
+        assert str(other) == "Dialogue: 1,0:00:00.00,0:00:05.00,Default,,0,0,0,,Hi"
+        assert view.toEvent() is views[0]
+
+        views[0] = Event(text="Replaced")
+        assert view.text == "Replaced"
+
+        # Views on their own are promoted on their own
+        line = "Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,Hello"
+        view = EventView(line, 0, len(line))
+        view.start = timedelta(seconds=1)
+        assert view.text == "Hello"
+        assert str(view) == line.replace("0:00:00.00", "0:00:01.00")
+
+    def test_mmap(self):
+        s = "[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\nDialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,Héllo\n"
+        with tempfile.TemporaryFile() as f:
+            f.write(s.encode())
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                views = EventViewList.fromBuffer(mm)
+                assert len(views) == 1
+                assert views[0].text == "Héllo"
+                assert views[0].end == timedelta(seconds=5)
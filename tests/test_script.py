@@ -1,5 +1,11 @@
+import copy
+import io
+import os
+import pickle
+import tempfile
 import textwrap
 
+import pyass
 from pyass import *
 
 
@@ -178,3 +184,277 @@ class TestScript:
             assert script.scriptInfo == o.scriptInfo
             assert script.styles == o.styles
             assert script.events == o.events
+
+    def test_iter(self):
+        s = textwrap.dedent(
+            """\
+            [Script Info]
+            ; Script generated by pyass
+            Title: Default Aegisub file
+
+            [V4+ Styles]
+            Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+            Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1
+            Style: Title,Arial,60,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1
+
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,hey it's me ur local monkey
+
+            Dialogue: 0,0:00:05.00,0:00:07.00,Title,,0,0,0,,{\\be1}how are you doing today
+
+            [Unknown Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:07.00,0:00:09.00,Default,,0,0,0,,not an event
+            """
+        )
+        script = loads(s)
+
+        sections = list(iter_sections(io.StringIO(s)))
+        assert sections == script.sections
+        assert [str(section) for section in sections] == [
+            str(section) for section in script.sections
+        ]
+
+        styles = list(iter_styles(io.StringIO(s)))
+        assert [str(style) for style in styles] == [
+            str(style) for style in script.styles
+        ]
+
+        events = list(iter_events(io.StringIO(s)))
+        assert len(events) == 3
+        assert [str(event) for event in events] == [
+            str(event) for event in script.events
+        ]
+
+    def test_lazy(self):
+        s = textwrap.dedent(
+            """\
+            [Script Info]
+            ; Script generated by pyass
+            Title: Default Aegisub file
+            PlayResX: 1920
+
+            [Aegisub Project Garbage]
+
+            [V4+ Styles]
+            Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+            Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1
+
+            [Events]
+            Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+            Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,hey it's me ur local monkey
+
+            [Aegisub Extradata]
+            Data: 1,a-mo,e
+            """
+        )
+        script = loads(s, lazy=True)
+        assert [type(section) for section in script.sections] == [
+            LazySection,
+            LazySection,
+            LazySection,
+            LazySection,
+            UnknownSection,
+        ]
+        assert dumps(script) == dumps(loads(s))
+
+        assert ("PlayResX", "1920") in script.scriptInfo
+        assert isinstance(script.sections[0], ScriptInfoSection)
+        assert isinstance(script.sections[3], LazySection)
+
+        script.events.append(Event(text="new event"))
+        assert isinstance(script.sections[3], EventsSection)
+        assert isinstance(script.sections[2], LazySection)
+        assert dumps(script).endswith(
+            textwrap.dedent(
+                """\
+                Dialogue: 0,0:00:00.00,0:00:05.00,Default,,0,0,0,,hey it's me ur local monkey
+                Dialogue: 0,0:00:00.00,0:00:00.00,Default,,0,0,0,,new event
+
+                [Aegisub Extradata]
+                Data: 1,a-mo,e
+                """
+            )
+        )
+
+        script.styles = [Style(name="Title")]
+        assert isinstance(script.sections[2], StylesSection)
+        assert script.styles[0].name == "Title"
+
+    def test_section_cache(self):
+        script = Script(events=[Event(text="a")])
+        events = script.events
+        assert script.events is events
+
+        # Every way of changing sections is picked up
+        script.sections[3] = EventsSection([Event(text="b")])
+        assert script.events is script.sections[3]
+
+        del script.sections[3]
+        try:
+            script.events
+            assert False
+        except AttributeError:
+            pass
+
+        script.sections.append(events)
+        assert script.events is events
+
+        script.events = [Event(text="c")]
+        assert script.events is not events
+        assert script.events[0].text == "c"
+
+        sections: list[Section] = [EventsSection(), ScriptInfoSection()]
+        script.sections = sections
+        assert script.events is script.sections[0]
+        assert script.scriptInfo is script.sections[1]
+
+        script.sections.insert(0, EventsSection([Event(text="d")]))
+        assert script.events[0].text == "d"
+
+        script.sections.reverse()
+        assert script.events is script.sections[1]
+        script.sections.sort(key=lambda section: isinstance(section, ScriptInfoSection))
+        assert script.events is script.sections[0]
+
+        # The assigned list is copied, so changing it leaves the script alone
+        sections.append(ScriptInfoSection([("Title", "e")]))
+        assert script.sections is not sections
+        assert script.scriptInfo.get("Title") is None
+
+        # Copies and pickles keep up with their own sections
+        for copied in [copy.deepcopy(script), pickle.loads(pickle.dumps(script))]:
+            assert copied.events == script.events
+            copied.sections[0] = EventsSection([Event(text="f")])
+            assert copied.events[0].text == "f"
+            assert script.events is script.sections[0]
+
+    def test_dump_streaming(self):
+        script = Script(
+            aegisubGarbage=[("Last Style Storage", "Default")],
+            events=[Event(text="a"), Event(text="b")],
+        )
+        s = dumps(script)
+        assert [line + "\n" for line in iter_lines(script)] == s.splitlines(True)
+
+        fp = io.StringIO()
+        dump(script, fp)
+        assert fp.getvalue() == s
+
+        for section in script.sections:
+            assert "\n".join(section.iterLines()) + "\n" == str(section)
+
+        # An empty Aegisub garbage section is left out
+        script.aegisubGarbage.clear()
+        assert "[Aegisub Project Garbage]" not in list(iter_lines(script))
+
+    def test_load_path(self):
+        s = dumps(
+            Script(
+                styles=[Style(name="Título")],
+                events=[Event(text="héllo"), Event(text="wörld")],
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "subtitles.ass")
+            for encoding, newline in [
+                ("utf_8", "\n"),
+                ("utf_8_sig", "\n"),
+                ("utf_8_sig", "\r\n"),
+                ("utf_32", "\n"),
+                ("utf_16", "\r\n"),
+            ]:
+                with open(path, "w", encoding=encoding, newline=newline) as f:
+                    f.write(s)
+
+                assert dumps(load_path(path)) == s
+                assert dumps(load_path(path, lazy=True)) == s
+                assert dumps(load_path(path, encoding=encoding)) == s
+
+            # Lines and characters split across chunks
+            chunkSize = pyass._DECODE_CHUNK_SIZE
+            try:
+                for pyass._DECODE_CHUNK_SIZE in range(1, 8):
+                    assert dumps(load_path(path)) == s
+            finally:
+                pyass._DECODE_CHUNK_SIZE = chunkSize
+
+            open(path, "w").close()
+            assert dumps(load_path(path)) == dumps(loads(""))
+
+    def test_compressed(self):
+        script = Script(events=[Event(text=f"event {i}") for i in range(1000)])
+        s = dumps(script)
+
+        with tempfile.TemporaryDirectory() as d:
+            for extension, magic in [
+                (".ass", b"\xef\xbb\xbf[Script Info]"),
+                (".ass.gz", b"\x1f\x8b"),
+                (".ass.bz2", b"BZh"),
+                (".ass.xz", b"\xfd7zXZ\x00"),
+            ]:
+                path = os.path.join(d, "subtitles" + extension)
+                dump_path(script, path)
+                with open(path, "rb") as f:
+                    assert f.read(len(magic)) == magic
+
+                assert dumps(load_path(path)) == s
+                assert dumps(load_path(path, lazy=True)) == s
+
+                # Compression is detected from the contents, not the extension
+                os.rename(path, os.path.join(d, "subtitles"))
+                assert dumps(load_path(os.path.join(d, "subtitles"))) == s
+
+    def test_workers(self):
+        script = Script(
+            events=[
+                Event(start=timedelta(seconds=i), text=f"{{\\be1}}event {i}")
+                for i in range(100)
+            ]
+        )
+        script.events.append(Event.parse("Invalid"))
+        s = dumps(script)
+
+        chunkSize = EventsSection._parallelChunkSize
+        try:
+            EventsSection._parallelChunkSize = 10
+            parsed = loads(s, workers=2)
+        finally:
+            EventsSection._parallelChunkSize = chunkSize
+
+        assert isinstance(parsed.events, EventsSection)
+        assert dumps(parsed) == s
+        assert [str(event) for event in parsed.events] == [
+            str(event) for event in loads(s).events
+        ]
+        assert isinstance(loads(s, lazy=True, workers=2).sections[-1], LazySection)
+
+    def test_dump_workers(self):
+        script = Script(
+            events=[
+                Event(start=timedelta(seconds=i), text=f"{{\\be1}}event {i}")
+                for i in range(100)
+            ]
+        )
+        script.events[0].parts[0].tags.append(BoldTag(True))
+        s = dumps(script)
+
+        chunkSize = EventsSection._parallelChunkSize
+        canShareMemory = EventsSection.__dict__["_canShareMemory"]
+        try:
+            EventsSection._parallelChunkSize = 10
+            assert dumps(script, workers=2) == s
+            assert list(iter_lines(script, workers=2)) == s.splitlines()
+
+            fp = io.StringIO()
+            dump(script, fp, workers=2)
+            assert fp.getvalue() == s
+
+            # Events are pickled to workers that cannot see them
+            EventsSection._canShareMemory = staticmethod(lambda: False)
+            assert dumps(script, workers=2) == s
+        finally:
+            EventsSection._parallelChunkSize = chunkSize
+            EventsSection._canShareMemory = canShareMemory
@@ -1,3 +1,6 @@
+import copy
+import pickle
+import random
 import textwrap
 
 from pyass import *
@@ -207,3 +210,216 @@ class TestSection:
         ]:
             assert str(o) == s
             assert Section.parse(s) == o
+
+    def test_iter_sections(self):
+        for lines, sections in [
+            ([], []),
+            (["[A]"], [UnknownSection("A", [])]),
+            (["[A]", ""], [UnknownSection("A", [])]),
+            (
+                ["[A]", "a", "", "[B]", "b"],
+                [UnknownSection("A", ["a"]), UnknownSection("B", ["b"])],
+            ),
+            (
+                ["[A]", "a", "", "", "[B]"],
+                [UnknownSection("A", ["a", ""]), UnknownSection("B", [])],
+            ),
+        ]:
+            assert list(Section.iterSections(lines)) == sections
+            assert list(Section.iterSections(lines, lazy=True)) == sections
+
+    def test_events_index(self):
+        def ev(start: int, end: int) -> Event:
+            return Event(
+                start=timedelta(centiseconds=start), end=timedelta(centiseconds=end)
+            )
+
+        def ids(events: list[Event]) -> list[int]:
+            return sorted(map(id, events))
+
+        a, b, c, d = ev(0, 100), ev(50, 150), ev(100, 200), ev(300, 300)
+        o = EventsSection([a, b, c, d])
+
+        assert o.activeAt(timedelta()) == [a]
+        assert ids(o.activeAt(timedelta(centiseconds=99))) == ids([a, b])
+        assert ids(o.activeAt(timedelta(centiseconds=100))) == ids([b, c])
+        assert o.activeAt(timedelta(centiseconds=300)) == []
+        assert ids(o.activeBetween(timedelta(), timedelta(centiseconds=51))) == ids(
+            [a, b]
+        )
+
+        # The index follows every kind of list mutation
+        e = ev(90, 110)
+        o.append(e)
+        o.remove(a)
+        o[0] = ev(0, 10)
+        del o[-3:-1]
+        o += [ev(1000, 2000)]
+        o.insert(0, ev(95, 96))
+        assert ids(o.activeAt(timedelta(centiseconds=95))) == ids([o[0], e])
+
+        o.shift(timedelta(seconds=1))
+        assert ids(o.activeAt(timedelta(centiseconds=195))) == ids([o[0], e])
+
+        e.start = Timestamp()
+        o.invalidateIndex()
+        assert e in o.activeAt(timedelta(centiseconds=1))
+
+        for other in [copy.copy(o), copy.deepcopy(o), pickle.loads(pickle.dumps(o))]:
+            other.pop()
+            assert len(other.activeAt(timedelta(seconds=20))) == 0
+            assert len(o.activeAt(timedelta(seconds=20))) == 1
+
+        o.clear()
+        assert o.activeBetween(timedelta(), timedelta(hours=1)) == []
+
+    def test_events_index_random(self):
+        rng = random.Random(0)
+        o = EventsSection()
+        for _ in range(500):
+            if o and rng.random() < 0.3:
+                del o[rng.randrange(len(o))]
+            else:
+                start = rng.randrange(1000)
+                o.append(
+                    Event(
+                        start=timedelta(centiseconds=start),
+                        end=timedelta(centiseconds=start + rng.randrange(200)),
+                    )
+                )
+
+            t = timedelta(centiseconds=rng.randrange(1200))
+            assert sorted(map(id, o.activeAt(t))) == sorted(
+                id(event) for event in o if event.start <= t < event.end
+            )
+
+    def test_styles_index(self):
+        a, b, a2 = Style(name="A"), Style(name="B"), Style(name="A", fontSize=10)
+        o = StylesSection([a, b])
+
+        assert o.getByName("A") is a
+        assert o.getByName("C") is None
+        assert o.getByName("C", b) is b
+
+        # Later definitions win
+        o.append(a2)
+        assert o.getByName("A") is a2
+        o.insert(0, Style(name="A"))
+        assert o.getByName("A") is a2
+        o.remove(a2)
+        assert o.getByName("A") is a
+        del o[0]
+        assert o.getByName("A") is a
+        o[1] = Style(name="C")
+        assert o.getByName("B") is None
+
+        b.name = "Renamed"
+        o.append(b)
+        a.name = "Other"
+        assert o.getByName("A") is None
+        assert o.getByName("Other") is a
+        assert o.getByName("Renamed") is b
+
+        assert o.resolveStyles(
+            [Event(style="Other"), Event(style="C"), Event(style="Missing")]
+        ) == [a, o[1], None]
+
+        o.clear()
+        assert o.getByName("Other") is None
+
+        # Reordering changes which definition comes last
+        x1, x2 = Style(name="X", fontSize=1), Style(name="X", fontSize=2)
+        o.extend([x1, x2])
+        assert o.getByName("X") is x2
+        o.reverse()
+        assert o.getByName("X") is x1
+        o.sort(key=lambda style: style.fontSize)
+        assert o.getByName("X") is x2
+
+        # Only renaming a style in the index rebuilds it
+        index = o._styleIndex
+        Style.parse(str(Style(name="Y")))
+        StylesSection([Style(name="Y")]).getByName("Y")
+        copy.deepcopy(x1).name = "Y"
+        pickle.loads(pickle.dumps(x1)).name = "Y"
+        assert o._styleIndex is index
+
+        x1.name = "Y"
+        assert o.getByName("Y") is x1
+        assert o.getByName("X") is x2
+
+    def test_script_info_keys(self):
+        s = textwrap.dedent(
+            """\
+            [Script Info]
+            ; Script generated by pyass
+            PlayResX: 640
+            Wrap Style: 1
+            ; PlayResY: 1
+            PlayResX: 1920
+            """
+        )
+        o = Section.parse(s)
+        assert isinstance(o, ScriptInfoSection)
+
+        # The last line of a key wins, and comments are not keys
+        assert o.get("PlayResX") == "1920"
+        assert o.get("PlayResY") is None
+        assert o.get("Missing", "x") == "x"
+        assert o.playResX == 1920
+        assert o.playResY is None
+        assert o.wrapStyle == Wrapping.END_OF_LINE
+        assert o.scaledBorderAndShadow is None
+
+        # Setting a key that exists keeps its index
+        index = o._keyIndex
+        o.playResX = 1280
+        assert o._keyIndex is index
+
+        o.playResY = 720
+        o.wrapStyle = Wrapping.NONE
+        o.scaledBorderAndShadow = True
+        o.yCbCrMatrix = "TV.709"
+        assert str(o) == textwrap.dedent(
+            """\
+            [Script Info]
+            ; Script generated by pyass
+            PlayResX: 640
+            Wrap Style: 2
+            ; PlayResY: 1
+            PlayResX: 1280
+            PlayResY: 720
+            ScaledBorderAndShadow: yes
+            YCbCr Matrix: TV.709
+            """
+        )
+
+        # Plain list mutations are picked up
+        o.insert(0, ("PlayResY", "1080"))
+        assert o.playResY == 720
+        del o[-3:]
+        assert o.playResY == 1080
+        o.clear()
+        assert o.playResX is None
+
+        o.wrapStyle = Wrapping.SMART
+        assert o == [("WrapStyle", "0")]
+
+        # Reordering moves keys to other lines
+        o = ScriptInfoSection([("A", "1"), ("B", "2")])
+        assert o.get("A") == "1"
+        o.reverse()
+        assert o.get("A") == "1"
+        o.set("A", "x")
+        assert o == [("B", "2"), ("A", "x")]
+        o.sort()
+        assert o.get("B") == "2"
+
+    def test_aegisub_garbage_keys(self):
+        o = AegisubGarbageSection([("Video File", "a.mkv")])
+        assert o.videoFile == "a.mkv"
+        assert o.audioFile is None
+
+        o.audioFile = "a.flac"
+        o.videoFile = "b.mkv"
+        assert o == [("Video File", "b.mkv"), ("Audio File", "a.flac")]
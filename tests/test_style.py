@@ -137,3 +137,20 @@ class TestStyle:
         ]:
             assert str(o) == s
             assert Style.parse(s) == o
+
+    def test_source_line(self):
+        # Untouched styles are printed exactly as they were read
+        s = "Style: Default,Arial,48,&HFFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2.00,2,2,10,10,10,1"
+        style = Style.parse(s)
+        assert str(style) == s
+        assert style == Style.parse(s)
+
+        style.primaryColor.r = 0x00
+        assert (
+            str(style)
+            == "Style: Default,Arial,48,&H00FFFF00,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1"
+        )
+
+        style = Style.parse(s)
+        style.outline = 3
+        assert ",1,3,2,2," in str(style)
@@ -269,3 +269,90 @@ class TestTag:
             r"\K100",
         ]:
             assert str(Tags.parse(s)[0]) == s
+
+    def test_prefix_fallback(self):
+        for s, o in [
+            # Falls back to \fad when \fade does not have 7 arguments
+            (r"\fade(200,100)", FadeTag(200, 100)),
+            (r"\bordx", UnknownTag(r"\bordx")),
+            (r"\frxabc", UnknownTag(r"\frxabc")),
+            (r"abc\b1", UnknownTag(r"abc\b1")),
+        ]:
+            assert Tag.parse(s) == o, f"Parse {s}"
+
+    def test_prefix_trie(self):
+        for prefix, TagType in Tag.prefixToTagType():
+            node = Tag.prefixTrie()
+            for c in prefix:
+                node = node[c]
+
+            assert node[""] is TagType
+
+    def test_tags(self):
+        for s, o in [
+            ("", [CommentTag("")]),
+            ("comment", [CommentTag("comment")]),
+            (
+                r"\an8\be1",
+                [AlignmentTag(Alignment.TOP), BlurEdgesTag(1)],
+            ),
+            (
+                r"comment\an8",
+                [CommentTag("comment"), AlignmentTag(Alignment.TOP)],
+            ),
+            (
+                r"\t(0,200,\an8\be1)\be2",
+                [
+                    TransformTag(
+                        start=timedelta(),
+                        end=timedelta(milliseconds=200),
+                        to=Tags([AlignmentTag(Alignment.TOP), BlurEdgesTag(1)]),
+                    ),
+                    BlurEdgesTag(2),
+                ],
+            ),
+            (
+                r"\clip(1,m 0 0 l 10 10)\be1",
+                [
+                    DrawingClipTag(False, 1, DrawingCommand("m 0 0 l 10 10")),
+                    BlurEdgesTag(1),
+                ],
+            ),
+            # Unbalanced brackets swallow the following tags
+            (r"\pos(1,2\be1", [UnknownTag(r"\pos(1,2\be1")]),
+            (r"\be1)\be2\be3", [UnknownTag(r"\be1)\be2\be3")]),
+        ]:
+            assert Tags.parse(s) == o, f"Parse {s}"
+            assert str(Tags.parse(s)) == s
+
+    def test_tags_cache(self):
+        cache = Tags.enableCache(maxsize=2)
+
+        def stats():
+            return (cache.hits, cache.misses, cache.evictions, len(cache))
+
+        try:
+            s = r"\pos(100,200)\t(0,200,\an8)\clip(1,m 0 0 l 10 10)"
+            tags = Tags.parse(s)
+            assert tags == Tags.parse(s)
+            assert stats() == (1, 2, 0, 2)
+
+            # Mutating a returned copy must not affect the cache
+            position, transform = tags[0], tags[1]
+            assert isinstance(position, PositionTag)
+            assert isinstance(transform, TransformTag)
+            position.position.x = 300
+            transform.to.append(BlurEdgesTag(1))
+            assert str(Tags.parse(s)) == s
+            assert stats() == (2, 2, 0, 2)
+
+            Tags.parse(r"\be1")
+            assert stats() == (2, 3, 1, 2)
+
+            cache.clear()
+            assert stats() == (0, 0, 0, 0)
+        finally:
+            Tags.disableCache()
+
+        Tags.parse(r"\be1")
+        assert cache.misses == 0
@@ -1,3 +1,5 @@
+import pickle
+
 from pyass import timedelta
 
 
@@ -50,3 +52,21 @@ class TestTimedelta:
         assert (
             timedelta(centiseconds=6) - timedelta(milliseconds=5)
         ).total_milliseconds() == 55
+
+    def test_batch(self):
+        strs = ["0:00:01.00", "0:00:02.50", "0:00:01.00", "12:00:00.00", "-0:00:01.00"]
+        tds = timedelta.parseMany(strs)
+        assert tds == [timedelta.parse(s) for s in strs]
+        assert all(isinstance(td, timedelta) for td in tds)
+        assert timedelta.formatMany(tds) == strs
+
+        # Non-canonical forms go through the fallback
+        assert timedelta.parseMany(["1:2:3.4", "100:00:00.00"]) == [
+            timedelta(hours=1, minutes=2, seconds=3, centiseconds=4),
+            timedelta(hours=100),
+        ]
+
+    def test_pickle(self):
+        td = timedelta(days=1, seconds=2, microseconds=3)
+        assert pickle.loads(pickle.dumps(td)) == td
+        assert isinstance(pickle.loads(pickle.dumps(td)), timedelta)
@@ -0,0 +1,89 @@
+import datetime
+
+from pyass import Timestamp, timedelta
+
+
+class TestTimestamp:
+    def test_timestamp(self):
+        for o, s in [
+            (Timestamp(), "0:00:00.00"),
+            (Timestamp(12), "0:00:00.12"),
+            (Timestamp(1200), "0:00:12.00"),
+            (Timestamp(72000), "0:12:00.00"),
+            (Timestamp(122), "0:00:01.22"),
+            (Timestamp(12200), "0:02:02.00"),
+            (Timestamp(732000), "2:02:00.00"),
+            (Timestamp(502567), "1:23:45.67"),
+            (Timestamp(4500000), "12:30:00.00"),
+            (-Timestamp(12), "-0:00:00.12"),
+            (-Timestamp(502567), "-1:23:45.67"),
+            (-Timestamp(4500000), "-12:30:00.00"),
+        ]:
+            assert str(o) == s
+            assert Timestamp.parse(s) == o
+            assert str(timedelta.parse(s)) == s
+            assert Timestamp(timedelta.parse(s)) == o
+
+    def test_timedelta_interop(self):
+        td = timedelta(hours=1, minutes=23, seconds=45, milliseconds=670)
+        ts = Timestamp(td)
+
+        assert ts == td and td == ts
+        assert hash(ts) == hash(td)
+        assert ts.toTimedelta() == td
+        assert timedelta(ts) == td
+        assert ts.total_seconds() == td.total_seconds()
+        assert ts.total_milliseconds() == td.total_milliseconds()
+        assert ts.total_centiseconds() == td.total_centiseconds()
+
+        assert ts < td + timedelta(milliseconds=1)
+        assert td - timedelta(milliseconds=1) < ts
+        assert ts != td + timedelta(milliseconds=1)
+
+        assert isinstance(ts + datetime.timedelta(seconds=1), Timestamp)
+        assert isinstance(datetime.timedelta(seconds=1) + ts, Timestamp)
+        assert isinstance(timedelta(seconds=1) + ts, Timestamp)
+        assert ts + timedelta(seconds=1) == Timestamp(502667)
+        assert timedelta(hours=2) - ts == Timestamp(217433)
+
+        # Dates and datetimes are moved by timestamps like they are by timedeltas
+        dt = datetime.datetime(2000, 1, 1)
+        assert dt + ts == ts + dt == dt + td
+        assert dt - ts == dt - td
+        assert datetime.date(2000, 1, 2) - Timestamp(8640000) == datetime.date(
+            2000, 1, 1
+        )
+
+        # Anything below a centisecond is truncated, like timedelta.__str__ does
+        assert Timestamp(timedelta(milliseconds=129)) == Timestamp(12)
+        assert Timestamp(-timedelta(milliseconds=129)) == Timestamp(-12)
+        assert str(Timestamp(timedelta(days=1, milliseconds=5))) == str(
+            timedelta(days=1, milliseconds=5)
+        )
+
+    def test_arithmetic(self):
+        assert Timestamp(150) + Timestamp(50) == Timestamp(200)
+        assert Timestamp(150) - Timestamp(200) == Timestamp(-50)
+        assert Timestamp(150) * 2 == Timestamp(300)
+        assert 2 * Timestamp(150) == Timestamp(300)
+        assert Timestamp(100) * 1.001 == Timestamp(100)
+        assert Timestamp(100000) * (24000 / 1001 / 25) == Timestamp(95904)
+        assert Timestamp(150) / 2 == Timestamp(75)
+        assert Timestamp(150) / Timestamp(50) == 3.0
+        assert Timestamp(150) // Timestamp(40) == 3
+        assert Timestamp(150) % Timestamp(40) == Timestamp(30)
+        assert abs(Timestamp(-150)) == Timestamp(150)
+        assert sorted([Timestamp(3), Timestamp(1), Timestamp(2)]) == [
+            Timestamp(1),
+            Timestamp(2),
+            Timestamp(3),
+        ]
+        assert not Timestamp()
+        assert Timestamp(1)
+
+    def test_batch(self):
+        strs = ["0:00:01.00", "0:00:02.50", "0:00:01.00", "12:00:00.00", "-0:00:01.00"]
+        timestamps = Timestamp.parseMany(strs)
+        assert timestamps == [Timestamp.parse(s) for s in strs]
+        assert Timestamp.formatMany(timestamps) == strs
+        assert Timestamp.formatMany([timedelta.parse(s) for s in strs]) == strs